@@ -0,0 +1,95 @@
+import argparse
+import time
+
+import numpy as np
+
+from common.typing import Matrix
+from lab_1.task_1 import lu_decompose
+
+
+def _reference_forward_step(m: Matrix, k: int) -> tuple[int, int, list[float]]:
+    n = m.shape[0]
+    swap_index = k
+
+    for i in range(k + 1, n):
+        a, b = m[i, k], m[swap_index, k]
+        if a * a > b * b:
+            swap_index = i
+
+    m[[k, swap_index]] = m[[swap_index, k]]
+
+    if m[k, k] == 0.0:
+        return k, k, []
+
+    coef = []
+
+    for i in range(k + 1, n):
+        c = m[i, k] / m[k, k]
+
+        for j in range(k, n):
+            m[i, j] -= c * m[k, j]
+
+        coef.append(c)
+
+    return k, swap_index, coef
+
+
+def _reference_lu_decompose(a: Matrix) -> tuple[Matrix, Matrix, Matrix]:
+    n = a.shape[0]
+
+    p = np.eye(n)
+    l = np.eye(n)
+    u = a.copy()
+
+    for k in range(n - 1):
+        *swap, coef = _reference_forward_step(u, k)
+
+        for i in range(len(coef)):
+            l[i + k + 1, k] = coef[i]
+
+        p[[swap[0], swap[1]]] = p[[swap[1], swap[0]]]
+
+        for t in range(k):
+            l[swap[0], t], l[swap[1], t] = l[swap[1], t], l[swap[0], t]
+
+    return l, u, p
+
+
+def _measure(func, *args, repeat: int = 1, **kwargs) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--sizes", type=int, nargs="+", default=[50, 100, 200, 500, 1000, 2000])
+    parser.add_argument("--reference-max-n", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args()
+
+
+def _main():
+    args = _parse_args()
+    rng = np.random.default_rng(0)
+
+    print(f"{'n':>6} {'reference, s':>14} {'blocked, s':>12} {'in-place, s':>12} {'speedup':>9}")
+
+    for n in args.sizes:
+        a = rng.standard_normal((n, n))
+
+        blocked = _measure(lu_decompose, a, repeat=args.repeat)
+        in_place = min(_measure(lu_decompose, a.copy(), overwrite_a=True) for _ in range(args.repeat))
+
+        if n <= args.reference_max_n:
+            reference = _measure(_reference_lu_decompose, a)
+            print(f"{n:>6} {reference:>14.4f} {blocked:>12.4f} {in_place:>12.4f} {reference / blocked:>8.1f}x")
+        else:
+            print(f"{n:>6} {'-':>14} {blocked:>12.4f} {in_place:>12.4f} {'-':>9}")
+
+
+if __name__ == "__main__":
+    _main()
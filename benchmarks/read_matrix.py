@@ -0,0 +1,65 @@
+import argparse
+import pathlib
+import tempfile
+import time
+from typing import TextIO
+
+import numpy as np
+
+from common.matrix_utils import load_matrix, read_matrix
+
+
+def _reference_read_matrix(m: int, n: int, input_stream: TextIO) -> np.ndarray[float]:
+    rows = []
+    for _ in range(m):
+        rows.append(list(map(float, input_stream.readline().strip().split())))
+    return np.array(rows)
+
+
+def _throughput(path: pathlib.Path, read) -> float:
+    start = time.perf_counter()
+    read(path)
+    elapsed = time.perf_counter() - start
+    return path.stat().st_size / elapsed / 2**20
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--sizes", type=int, nargs="+", default=[500, 1000, 2000, 4000])
+    return parser.parse_args()
+
+
+def _main():
+    args = _parse_args()
+    rng = np.random.default_rng(0)
+
+    print(f"{'n':>6} {'text, MB':>9} {'reference, MB/s':>16} {'streaming, MB/s':>16} {'npy mmap, MB/s':>15}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for n in args.sizes:
+            a = rng.standard_normal((n, n))
+            text_path = pathlib.Path(directory) / f"{n}.txt"
+            npy_path = pathlib.Path(directory) / f"{n}.npy"
+            np.savetxt(text_path, a)
+            np.save(npy_path, a)
+
+            def read_reference(path):
+                with path.open("r", encoding="utf-8") as file:
+                    return _reference_read_matrix(n, n, file)
+
+            def read_streaming(path):
+                with path.open("r", encoding="utf-8") as file:
+                    return read_matrix(n, n, file)
+
+            def read_npy(path):
+                return np.asarray(load_matrix(path)).sum()
+
+            size = text_path.stat().st_size / 2**20
+            reference = _throughput(text_path, read_reference)
+            streaming = _throughput(text_path, read_streaming)
+            npy = _throughput(npy_path, read_npy)
+            print(f"{n:>6} {size:>9.1f} {reference:>16.1f} {streaming:>16.1f} {npy:>15.1f}")
+
+
+if __name__ == "__main__":
+    _main()
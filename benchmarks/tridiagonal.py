@@ -0,0 +1,80 @@
+import argparse
+import time
+
+import numpy as np
+
+from common.typing import Matrix
+from lab_1.task_2 import METHODS, batch_solve_system, solve_system
+
+
+def _random_systems(rng: np.random.Generator, batch: int, n: int) -> tuple[Matrix, Matrix]:
+    A = rng.uniform(-1.0, 1.0, (batch, n, 3))
+    A[..., 1] += 4.0 * np.sign(A[..., 1])
+    A[:, 0, 0] = A[:, -1, 2] = 0.0
+    b = rng.uniform(-1.0, 1.0, (batch, n))
+    return A, b
+
+
+def _measure(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def _loop(A: Matrix, b: Matrix) -> None:
+    for i in range(len(A)):
+        solve_system(A[i], b[i])
+
+
+def _benchmark_batch(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(0)
+    A, b = _random_systems(rng, args.batch, args.n)
+
+    loop_batch = min(args.loop_batch, args.batch)
+    loop = _measure(_loop, A[:loop_batch], b[:loop_batch]) * args.batch / loop_batch
+    batched = _measure(batch_solve_system, A, b)
+
+    print(f"batch = {args.batch}, n = {args.n}")
+    print(f"solve_system loop:  {loop:.3f} s (extrapolated from {loop_batch} systems)")
+    print(f"batch_solve_system: {batched:.3f} s")
+    print(f"speedup: {loop / batched:.1f}x")
+
+
+def _benchmark_methods(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(0)
+    variants = [(method, {}) for method in METHODS] + [("partitioned", {"workers": args.workers})]
+    names = [f"{method}, s" if not options else f"{method} x{args.workers}, s" for method, options in variants]
+
+    print(f"{'n':>10} " + " ".join(f"{name:>20}" for name in names))
+
+    for n in args.sizes:
+        A, b = _random_systems(rng, 1, n)
+        times = [_measure(solve_system, A[0], b[0], method, **options) for method, options in variants]
+        print(f"{n:>10} " + " ".join(f"{t:>20.4f}" for t in times))
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(required=True)
+
+    batch = subparsers.add_parser("batch", help="batched Thomas solver against a loop of solve_system")
+    batch.add_argument("--batch", type=int, default=10000)
+    batch.add_argument("-n", type=int, default=1000)
+    batch.add_argument("--loop-batch", type=int, default=500, help="systems solved one by one to extrapolate the loop time")
+    batch.set_defaults(run=_benchmark_batch)
+
+    methods = subparsers.add_parser("methods", help="solve_system methods on a single large system")
+    methods.add_argument("-n", "--sizes", type=int, nargs="+", default=[10**3, 10**4, 10**5, 10**6, 10**7])
+    methods.add_argument("--workers", type=int, default=4)
+    methods.set_defaults(run=_benchmark_methods)
+
+    return parser.parse_args()
+
+
+def _main():
+    args = _parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,253 @@
+import heapq
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import sympy
+
+
+def _down(x: float) -> float:
+    return float(np.nextafter(x, -np.inf))
+
+
+def _up(x: float) -> float:
+    return float(np.nextafter(x, np.inf))
+
+
+def _product(x: float, y: float) -> float:
+    # 0 * inf appears only at the infinite ends, the exact product there is 0
+    if x == 0.0 or y == 0.0:
+        return 0.0
+    return x * y
+
+
+@dataclass(frozen=True)
+class Interval:
+    """
+    Closed interval [lo, hi], every operation rounds the ends outward,
+    so the result contains all values of the operation on the operands.
+    """
+
+    lo: float
+    hi: float
+
+    @classmethod
+    def point(cls, value: float) -> "Interval":
+        return cls(value, value)
+
+    def __add__(self, other: "Interval | float") -> "Interval":
+        other = _as_interval(other)
+        return Interval(_down(self.lo + other.lo), _up(self.hi + other.hi))
+
+    __radd__ = __add__
+
+    def __neg__(self) -> "Interval":
+        return Interval(-self.hi, -self.lo)
+
+    def __sub__(self, other: "Interval | float") -> "Interval":
+        return self + (-_as_interval(other))
+
+    def __rsub__(self, other: float) -> "Interval":
+        return _as_interval(other) - self
+
+    def __mul__(self, other: "Interval | float") -> "Interval":
+        other = _as_interval(other)
+        products = [_product(x, y) for x in (self.lo, self.hi) for y in (other.lo, other.hi)]
+        return Interval(_down(min(products)), _up(max(products)))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: "Interval | float") -> "Interval":
+        other = _as_interval(other)
+        if other.lo <= 0.0 <= other.hi:
+            return Interval(-math.inf, math.inf)
+        return self * Interval(_down(1.0 / other.hi), _up(1.0 / other.lo))
+
+    def __rtruediv__(self, other: float) -> "Interval":
+        return _as_interval(other) / self
+
+    def __pow__(self, n: int) -> "Interval":
+        if n == 0:
+            return Interval.point(1.0)
+        if n < 0:
+            return 1.0 / self**-n
+
+        if n % 2 == 0:
+            x = abs(self)
+            return Interval(max(0.0, _down(_power(x.lo, n))), _up(_power(x.hi, n)))
+        return Interval(_down(_power(self.lo, n)), _up(_power(self.hi, n)))
+
+    def __abs__(self) -> "Interval":
+        if self.lo >= 0.0:
+            return self
+        if self.hi <= 0.0:
+            return -self
+        return Interval(0.0, max(-self.lo, self.hi))
+
+    @property
+    def magnitude(self) -> float:
+        return max(abs(self.lo), abs(self.hi))
+
+    @property
+    def mignitude(self) -> float:
+        return abs(self).lo
+
+
+def _power(x: float, n: int) -> float:
+    try:
+        return x**n
+    except OverflowError:
+        return math.copysign(math.inf, x) if n % 2 else math.inf
+
+
+def _as_interval(value: Interval | float) -> Interval:
+    if isinstance(value, Interval):
+        return value
+    return Interval.point(float(value))
+
+
+def _monotonic(func, x: Interval) -> Interval:
+    return Interval(_down(func(x.lo)), _up(func(x.hi)))
+
+
+def _contains_point(x: Interval, start: float, period: float) -> bool:
+    # whether some `start + k * period` lies in `x`
+    k = math.ceil((x.lo - start) / period)
+    return start + k * period <= x.hi
+
+
+def _periodic(func, x: Interval, peak: float, trough: float) -> Interval:
+    if not math.isfinite(x.lo) or not math.isfinite(x.hi) or x.hi - x.lo >= 2.0 * math.pi:
+        return Interval(-1.0, 1.0)
+    values = (func(x.lo), func(x.hi))
+    lo = -1.0 if _contains_point(x, trough, 2.0 * math.pi) else max(-1.0, _down(min(values)))
+    hi = 1.0 if _contains_point(x, peak, 2.0 * math.pi) else min(1.0, _up(max(values)))
+    return Interval(lo, hi)
+
+
+def _exp(x: Interval) -> Interval:
+    return Interval(max(0.0, _down(_safe_exp(x.lo))), _up(_safe_exp(x.hi)))
+
+
+def _safe_exp(x: float) -> float:
+    try:
+        return math.exp(x)
+    except OverflowError:
+        return math.inf
+
+
+def _log(x: Interval) -> Interval:
+    if x.hi <= 0.0:
+        raise ValueError("Logarithm of non-positive values")
+    lo = -math.inf if x.lo <= 0.0 else _down(math.log(x.lo))
+    return Interval(lo, _up(math.log(x.hi)))
+
+
+def _sqrt(x: Interval) -> Interval:
+    if x.hi < 0.0:
+        raise ValueError("Square root of negative values")
+    return Interval(_down(math.sqrt(max(0.0, x.lo))), _up(math.sqrt(x.hi)))
+
+
+def _sin(x: Interval) -> Interval:
+    return _periodic(math.sin, x, math.pi / 2.0, -math.pi / 2.0)
+
+
+def _cos(x: Interval) -> Interval:
+    return _periodic(math.cos, x, 0.0, math.pi)
+
+
+def _tan(x: Interval) -> Interval:
+    if not math.isfinite(x.lo) or not math.isfinite(x.hi) or x.hi - x.lo >= math.pi or _contains_point(x, math.pi / 2.0, math.pi):
+        return Interval(-math.inf, math.inf)
+    return _monotonic(math.tan, x)
+
+
+def _atan(x: Interval) -> Interval:
+    return _monotonic(math.atan, x)
+
+
+def _sign(x: Interval) -> Interval:
+    lo = -1.0 if x.lo < 0.0 else (0.0 if x.lo == 0.0 else 1.0)
+    hi = 1.0 if x.hi > 0.0 else (0.0 if x.hi == 0.0 else -1.0)
+    return Interval(lo, hi)
+
+
+def _general_power(base: Interval, exponent: Interval) -> Interval:
+    if base.lo < 0.0:
+        raise ValueError("Non-integer power of negative values")
+    return _exp(exponent * _log(base)) if base.hi > 0.0 else Interval.point(0.0)
+
+
+_FUNCTIONS = {
+    sympy.exp: _exp,
+    sympy.log: _log,
+    sympy.sin: _sin,
+    sympy.cos: _cos,
+    sympy.tan: _tan,
+    sympy.atan: _atan,
+    sympy.Abs: abs,
+    sympy.sign: _sign,
+}
+
+
+def evaluate(expr: sympy.Expr, variables: dict[str, Interval]) -> Interval:
+    """
+    Bounds of `expr` when every variable takes values from its interval.
+    """
+
+    if expr.is_Symbol:
+        return variables[expr.name]
+    if expr.is_Integer:
+        return Interval.point(float(expr))
+    if expr.is_number:
+        value = float(expr)
+        return Interval(_down(value), _up(value))
+    if expr.is_Add:
+        return sum((evaluate(arg, variables) for arg in expr.args[1:]), evaluate(expr.args[0], variables))
+    if expr.is_Mul:
+        result = evaluate(expr.args[0], variables)
+        for arg in expr.args[1:]:
+            result = result * evaluate(arg, variables)
+        return result
+    if expr.is_Pow:
+        base, exponent = expr.args
+        if exponent.is_Integer:
+            return evaluate(base, variables) ** int(exponent)
+        if exponent == sympy.Rational(1, 2):
+            return _sqrt(evaluate(base, variables))
+        return _general_power(evaluate(base, variables), evaluate(exponent, variables))
+    if expr.func in _FUNCTIONS:
+        return _FUNCTIONS[expr.func](evaluate(expr.args[0], variables))
+    raise ValueError(f"Unsupported expression: {expr.func.__name__}")
+
+
+def max_abs(expr: sympy.Expr, variable: str, a: float, b: float, rtol: float = 1e-3, max_pieces: int = 64) -> float:
+    """
+    Upper bound of |expr| on [a, b]. The piece with the largest bound is
+    bisected until the bound is within `rtol` of a value reached at some
+    midpoint or `max_pieces` pieces were made.
+    """
+
+    def _bound(lo: float, hi: float) -> float:
+        return evaluate(expr, {variable: Interval(lo, hi)}).magnitude
+
+    def _reached(lo: float, hi: float) -> float:
+        return evaluate(expr, {variable: Interval.point((lo + hi) / 2.0)}).mignitude
+
+    a, b = min(a, b), max(a, b)
+    pieces = [(-_bound(a, b), a, b)]
+    reached = _reached(a, b)
+
+    for _ in range(max_pieces - 1):
+        upper, lo, hi = pieces[0]
+        if -upper <= reached * (1.0 + rtol):
+            break
+
+        heapq.heappop(pieces)
+        mid = (lo + hi) / 2.0
+        for piece in ((lo, mid), (mid, hi)):
+            heapq.heappush(pieces, (-_bound(*piece), *piece))
+            reached = max(reached, _reached(*piece))
+
+    return -pieces[0][0]
@@ -1,38 +1,103 @@
-from itertools import product
-from typing import overload
+import weakref
+from typing import Callable, overload
 
 import numpy as np
 
-from common.typing import Function, MultiArgFunction, Vector
+from common.typing import Function, Matrix, MultiArgFunction, Vector
+
+MAX_VALUE_BUDGET = 2000
+_CANDIDATES = 3
+_REFINE_POINTS = 5
+
+_max_value_cache: "weakref.WeakKeyDictionary[Callable, dict]" = weakref.WeakKeyDictionary()
 
 
 @overload
-def max_value(f: Function, a: float, b: float) -> float: ...
+def max_value(f: Function, a: float, b: float, budget: int = MAX_VALUE_BUDGET) -> float: ...
 
 
 @overload
-def max_value(f: MultiArgFunction, a: Vector, b: Vector) -> float: ...
+def max_value(f: MultiArgFunction, a: Vector, b: Vector, budget: int = MAX_VALUE_BUDGET) -> float: ...
 
 
 def max_value(
     f: Function | MultiArgFunction,
     a: float | Vector,
     b: float | Vector,
+    budget: int = MAX_VALUE_BUDGET,
 ) -> float:
-    if isinstance(a, float):
-        return _max_value_1d(f, a, b)
-    return _max_value_2d(f, a, b)
+    """
+    Estimates the maximum of `f` on [a, b] using about `budget` evaluations:
+    a coarse grid first, then finer grids around the best points. `f` is
+    called on whole batches when it accepts arrays. Results are memoized
+    per (f, interval).
+    """
+
+    key = (tuple(np.ravel(a).tolist()), tuple(np.ravel(b).tolist()), budget)
+    try:
+        cache = _max_value_cache.setdefault(f, {})
+    except TypeError:
+        cache = {}
+
+    if key not in cache:
+        evaluate = _batch_evaluator(f, np.ndim(a) == 0)
+        a, b = np.ravel(a).astype(np.float64), np.ravel(b).astype(np.float64)
+        cache[key] = _max_value(evaluate, np.minimum(a, b), np.maximum(a, b), budget)
+    return cache[key]
+
+
+def _batch_evaluator(f: Function | MultiArgFunction, scalar: bool) -> Callable[[Matrix], Vector]:
+    vectorized = True
+
+    def _evaluate(points: Matrix) -> Vector:
+        nonlocal vectorized
+        args = points[:, 0] if scalar else points
+
+        if vectorized:
+            try:
+                with np.errstate(all="ignore"):
+                    values = np.asarray(f(args.T), dtype=np.float64)
+                if values.shape == (len(points),):
+                    return np.where(np.isnan(values), -np.inf, values)
+            except Exception:
+                pass
+            vectorized = False
+
+        values = np.array([f(x) for x in args], dtype=np.float64)
+        return np.where(np.isnan(values), -np.inf, values)
+
+    return _evaluate
+
+
+def _grid(a: Vector, b: Vector, points: int) -> Matrix:
+    axes = [np.linspace(i, j, points) for i, j in zip(a, b)]
+    return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, len(a))
+
+
+def _max_value(evaluate: Callable[[Matrix], Vector], a: Vector, b: Vector, budget: int) -> float:
+    d = len(a)
+    points_per_axis = max(2, int((budget / 2) ** (1 / d)))
+    points = _grid(a, b, points_per_axis)
+    values = evaluate(points)
+    used = len(points)
 
+    best = values.max()
+    candidates = points[np.argsort(values)[-_CANDIDATES:]]
+    step = (b - a) / (points_per_axis - 1)
+    min_step = 1e-12 * max(1.0, np.abs(b - a).max())
+    local_size = _REFINE_POINTS**d
 
-def _max_value_1d(f: Function, a: float, b: float) -> float:
-    step = 0.001
-    return max((f(x) for x in np.arange(a, b, step)), default=0.0)
+    # every round halves the step around the best points found so far
+    while step.max() > min_step and used + len(candidates) * local_size <= budget:
+        points = np.concatenate([_grid(np.maximum(c - step, a), np.minimum(c + step, b), _REFINE_POINTS) for c in candidates])
+        values = evaluate(points).reshape(len(candidates), local_size)
+        used += len(points)
 
+        best = max(best, values.max())
+        candidates = points.reshape(len(candidates), local_size, d)[np.arange(len(candidates)), values.argmax(axis=1)]
+        step = step / 2.0
 
-def _max_value_2d(f: MultiArgFunction, a: Vector, b: Vector) -> float:
-    step = 0.01
-    ranges = [np.arange(i, j, step) for i, j in zip(a, b)]
-    return max(map(f, product(*ranges)))
+    return float(best)
 
 
 def derivative(f: Function, dx: float = 0.0001) -> Function:
@@ -1,13 +1,75 @@
-import numpy as np
+import pathlib
+import struct
 from typing import TextIO
 
+import numpy as np
+
+
+def read_row(input_stream: TextIO, out: np.ndarray[float]) -> None:
+    line = input_stream.readline()
+    values = np.fromstring(line, dtype=out.dtype, sep=" ")
+    if values.shape[0] != out.shape[0]:
+        raise ValueError(f"expected {out.shape[0]} numbers in line, got {line.strip()!r}")
+    out[:] = values
+
+
+def read_matrix(m: int, n: int, input_stream: TextIO, out: np.ndarray[float] | None = None) -> np.ndarray[float]:
+    # every line is parsed straight into the row of the preallocated buffer
+    if out is None:
+        out = np.empty((m, n))
+    for i in range(m):
+        read_row(input_stream, out[i])
+    return out
+
+
+def read_vector(n: int, input_stream: TextIO, out: np.ndarray[float] | None = None) -> np.ndarray[float]:
+    if out is None:
+        out = np.empty(n)
+    read_row(input_stream, out)
+    return out
+
+
+def load_matrix(path: pathlib.Path, mmap: bool = True) -> np.ndarray[float]:
+    # `.npy` files are mapped into memory without reading them
+    return np.load(path, mmap_mode="r" if mmap else None)
+
+
+# binary system container: header, then raw `A` and raw `b`
+
+SYSTEM_MAGIC = b"NMSYS\x00\x00\x01"
+_SYSTEM_HEADER = struct.Struct("<8s8s1s7xQQQ")
+_SYSTEM_DATA_OFFSET = 64
+
+
+def is_system_file(path: pathlib.Path) -> bool:
+    with path.open("rb") as file:
+        return file.read(len(SYSTEM_MAGIC)) == SYSTEM_MAGIC
+
+
+def write_system(path: pathlib.Path, A: np.ndarray[float], b: np.ndarray[float]) -> None:
+    order = "F" if A.flags.f_contiguous and not A.flags.c_contiguous else "C"
+    dtype = np.result_type(A.dtype, b.dtype)
+    b_cols = 0 if b.ndim == 1 else b.shape[1]
+    header = _SYSTEM_HEADER.pack(SYSTEM_MAGIC, dtype.str.encode(), order.encode(), A.shape[0], A.shape[1], b_cols)
+
+    with path.open("wb") as file:
+        file.write(header.ljust(_SYSTEM_DATA_OFFSET, b"\x00"))
+        file.write(np.asarray(A, dtype=dtype).tobytes(order=order))
+        file.write(np.asarray(b, dtype=dtype).tobytes(order=order))
+
+
+def open_system(path: pathlib.Path) -> tuple[np.ndarray[float], np.ndarray[float]]:
+    # the matrix and the vector are mapped into memory, nothing is parsed
+    with path.open("rb") as file:
+        magic, dtype, order, rows, cols, b_cols = _SYSTEM_HEADER.unpack(file.read(_SYSTEM_HEADER.size))
 
-def read_matrix(m: int, n: int, input_stream: TextIO) -> np.ndarray[float]:
-    rows = []
-    for _ in range(m):
-        rows.append(list(map(float, input_stream.readline().strip().split())))
-    return np.array(rows)
+    if magic != SYSTEM_MAGIC:
+        raise ValueError(f"{path} is not a system file")
 
+    dtype = np.dtype(dtype.rstrip(b"\x00").decode())
+    order = order.decode()
+    b_shape = (rows,) if b_cols == 0 else (rows, b_cols)
 
-def read_vector(n: int, input_stream: TextIO) -> np.ndarray[float]:
-    return np.array(list(map(float, input_stream.readline().strip().split())))
+    A = np.memmap(path, dtype=dtype, mode="r", offset=_SYSTEM_DATA_OFFSET, shape=(rows, cols), order=order)
+    b = np.memmap(path, dtype=dtype, mode="r", offset=_SYSTEM_DATA_OFFSET + A.nbytes, shape=b_shape, order=order)
+    return A, b
@@ -8,3 +8,4 @@ MultiArgFunction = Callable[[NDArray[np.float64]], float]
 
 Matrix = NDArray[np.float64]
 Vector = NDArray[np.float64]
+Permutation = NDArray[np.intp]
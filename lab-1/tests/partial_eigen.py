@@ -0,0 +1,30 @@
+import sys
+import numpy as np
+
+from tests import _adapter
+
+sys.path.append(str(_adapter.LAB_DIR.absolute().parent))
+from lab_1.partial_eigen import METHODS, partial_eigen
+
+
+def check(A: np.ndarray[float], k: int, eps: float, values: np.ndarray[float], vectors: np.ndarray[float]) -> bool:
+    expected = sorted(np.linalg.eigvalsh(A), key=abs, reverse=True)[:k]
+    if not np.allclose(sorted(values), sorted(expected), atol=eps):
+        return False
+    return bool(np.abs(A @ vectors - vectors * values).max() < eps)
+
+
+# repeated eigen values make the Krylov space invariant before `k` steps
+testcases = [
+    (np.array([[4, 2, 1], [2, 5, 3], [1, 3, 6]], dtype=float), 2),
+    (np.diag([5.0, 5.0, 5.0, 1.0, 1.0, 0.5]), 3),
+    (np.diag(np.r_[np.full(100, 5.0), np.full(100, 1.0)]), 2),
+    (np.eye(5), 2),
+]
+precision = 0.0001
+
+for i, (matrix, k) in enumerate(testcases, 1):
+    for method in METHODS:
+        result = partial_eigen(matrix, k, method=method)
+        ok = result.converged and check(matrix, k, precision, result.values, result.vectors)
+        print(f'Test #{i} (python, {method}): {"OK" if ok else "FAILED"}')
@@ -1,9 +1,13 @@
 import pathlib
+import sys
 import numpy as np
 from dataclasses import dataclass
 
 from tests import _adapter
 
+sys.path.append(str(_adapter.LAB_DIR.absolute().parent))
+from lab_1.task_4 import solve_eigen_task
+
 
 @dataclass
 class SolutionResult:
@@ -70,3 +74,7 @@ adapter = SolutionAdapter()
 for i, matrix in enumerate(testcases, 1):
     result = adapter.run((matrix, precision))
     print(f'Test #{i}: {"OK" if check(matrix, precision, result) else "FAILED"}')
+
+    for strategy in ("max", "cyclic"):
+        result = solve_eigen_task(matrix, precision, strategy)
+        print(f'Test #{i} (python, {strategy}): {"OK" if check(matrix, precision, result) else "FAILED"}')
@@ -0,0 +1,163 @@
+from typing import TextIO
+
+import numpy as np
+
+from common.matrix_utils import read_row
+from common.typing import Matrix, Permutation, Vector
+
+
+class BandedMatrix:
+    """
+    Matrix with `kl` sub-diagonals and `ku` super-diagonals stored in the
+    LAPACK band layout: `A[i, j]` is `ab[ku + i - j, j]`, so `ab` has the
+    shape `(kl + ku + 1, n)`.
+    """
+
+    def __init__(self, kl: int, ku: int, ab: Matrix) -> None:
+        if ab.shape[0] != kl + ku + 1:
+            raise ValueError(f"band storage must have {kl + ku + 1} rows, got {ab.shape[0]}")
+        self.kl = kl
+        self.ku = ku
+        self.ab = ab
+
+    @property
+    def n(self) -> int:
+        return self.ab.shape[1]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.n, self.n
+
+    @classmethod
+    def from_dense(cls, a: Matrix, kl: int, ku: int) -> "BandedMatrix":
+        n = a.shape[0]
+        ab = np.zeros((kl + ku + 1, n), dtype=np.result_type(a.dtype, np.float32))
+        for k in range(-kl, ku + 1):
+            diagonal = np.diagonal(a, k)
+            ab[ku - k, max(k, 0) : max(k, 0) + len(diagonal)] = diagonal
+        return cls(kl, ku, ab)
+
+    def to_dense(self) -> Matrix:
+        a = np.zeros(self.shape, dtype=self.ab.dtype)
+        for k in range(-self.kl, self.ku + 1):
+            start = max(k, 0)
+            length = self.n - abs(k)
+            if length <= 0:
+                continue
+            a[np.arange(length) + max(-k, 0), np.arange(length) + start] = self.ab[self.ku - k, start : start + length]
+        return a
+
+    def __matmul__(self, x: Vector | Matrix) -> Vector | Matrix:
+        # one vectorized product per stored diagonal
+        y = np.zeros(np.shape(x), dtype=np.result_type(self.ab.dtype, x.dtype))
+        for k in range(-self.kl, self.ku + 1):
+            start = max(k, 0)
+            length = self.n - abs(k)
+            if length <= 0:
+                continue
+            diagonal = self.ab[self.ku - k, start : start + length]
+            rows = slice(max(-k, 0), max(-k, 0) + length)
+            y[rows] += (diagonal * x[start : start + length].T).T
+        return y
+
+
+class BandedLUFactorization:
+    """
+    Band LU decomposition with partial pivoting (`gbtrf` layout): the
+    upper factor takes `kl + ku + 1` rows at the top of `lu` (it grows by
+    `kl` diagonals because of row interchanges), the multipliers are stored
+    in the `kl` rows below, `ipiv[j]` is the row swapped with `j` at step `j`.
+    """
+
+    def __init__(self, kl: int, ku: int, lu: Matrix, ipiv: Permutation) -> None:
+        self.kl = kl
+        self.ku = ku
+        self.lu = lu
+        self.ipiv = ipiv
+
+    @property
+    def n(self) -> int:
+        return self.lu.shape[1]
+
+    def det(self) -> float:
+        d = 1.0
+        for value in self.lu[self.kl + self.ku].tolist():
+            d *= value
+        swaps = np.count_nonzero(self.ipiv != np.arange(self.n))
+        return -d if swaps % 2 else d
+
+    def solve(self, b: Vector | Matrix) -> Vector | Matrix:
+        n, kl, kv = self.n, self.kl, self.kl + self.ku
+        lu = self.lu
+        x = np.array(b, dtype=np.result_type(lu.dtype, b.dtype))
+
+        # L with the row interchanges made during the factorization
+        for j in range(n - 1):
+            p = self.ipiv[j]
+            if p != j:
+                x[[j, p]] = x[[p, j]]
+            km = min(kl, n - 1 - j)
+            x[j + 1 : j + km + 1] -= np.multiply.outer(lu[kv + 1 : kv + km + 1, j], x[j])
+
+        # U is upper triangular with `kv` super-diagonals
+        for j in range(n - 1, -1, -1):
+            x[j] /= lu[kv, j]
+            top = max(0, j - kv)
+            x[top:j] -= np.multiply.outer(lu[kv - (j - top) : kv, j], x[j])
+
+        return x
+
+
+def band_lu_factor(m: BandedMatrix) -> BandedLUFactorization:
+    n, kl, ku = m.n, m.kl, m.ku
+    kv = kl + ku
+
+    # extra `kl` rows on top take the fill-in caused by pivoting
+    lu = np.zeros((2 * kl + ku + 1, n), dtype=m.ab.dtype)
+    lu[kl:] = m.ab
+    ipiv = np.arange(n)
+    ju = 0
+
+    for j in range(n):
+        km = min(kl, n - 1 - j)
+
+        # find element with maximum square to avoid small dividers
+        p = j + int(np.argmax(np.abs(lu[kv : kv + km + 1, j])))
+        ipiv[j] = p
+        if lu[kv + p - j, j] == 0.0:
+            continue
+
+        ju = min(max(ju, j + ku + p - j), n - 1)
+        columns = np.arange(j, ju + 1)
+
+        if p != j:
+            rows_j, rows_p = kv + j - columns, kv + p - columns
+            lu[rows_j, columns], lu[rows_p, columns] = lu[rows_p, columns], lu[rows_j, columns]
+
+        if km == 0:
+            continue
+
+        lu[kv + 1 : kv + km + 1, j] /= lu[kv, j]
+
+        if ju > j:
+            columns = columns[1:]
+            u = lu[kv + j - columns, columns]
+            rows = np.arange(j + 1, j + km + 1)[:, None]
+            lu[kv + rows - columns, columns] -= np.outer(lu[kv + 1 : kv + km + 1, j], u)
+
+    return BandedLUFactorization(kl, ku, lu, ipiv)
+
+
+def read_banded_matrix(n: int, kl: int, ku: int, input_stream: TextIO) -> BandedMatrix:
+    # row `i` lists the elements of columns `max(0, i - kl) ... min(n - 1, i + ku)`
+    ab = np.zeros((kl + ku + 1, n))
+    row = np.empty(kl + ku + 1)
+
+    for i in range(n):
+        start, stop = max(0, i - kl), min(n - 1, i + ku)
+        values = row[: stop - start + 1]
+        read_row(input_stream, values)
+        columns = np.arange(start, stop + 1)
+        ab[ku + i - columns, columns] = values
+
+    return BandedMatrix(kl, ku, ab)
@@ -0,0 +1,109 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from common.typing import Matrix, Permutation, Vector
+
+
+class BatchLUFactorization(NamedTuple):
+    """
+    Packed LU decompositions of a stack of matrices `(batch, n, n)`,
+    laid out as `lab_1.task_1.LUFactorization` for every item.
+    """
+
+    lu: Matrix
+    perm: Permutation
+    sign: Vector
+
+    def det(self) -> Vector:
+        n = self.lu.shape[1]
+        d = np.ones(self.lu.shape[0], dtype=self.lu.dtype)
+
+        for i in range(n):
+            d *= self.lu[:, i, i]
+
+        return self.sign * d
+
+    def solve(self, b: Matrix) -> Matrix:
+        batch, n = self.lu.shape[:2]
+        x = np.array(b, dtype=np.result_type(self.lu.dtype, b.dtype))
+        x = x[np.arange(batch)[:, None], self.perm]
+        column = x.ndim == 2
+        if column:
+            x = x[:, :, None]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for i in range(1, n):
+                x[:, i] -= (self.lu[:, i, None, :i] @ x[:, :i])[:, 0]
+
+            for i in range(n - 1, -1, -1):
+                x[:, i] -= (self.lu[:, i, None, i + 1 :] @ x[:, i + 1 :])[:, 0]
+                x[:, i] /= self.lu[:, i, i, None]
+
+        return x[:, :, 0] if column else x
+
+
+class BatchSolution(NamedTuple):
+    x: Matrix
+    det: Vector
+    singular: NDArray[np.bool_]
+
+
+def batch_lu_decompose(a: Matrix, overwrite_a: bool = False) -> BatchLUFactorization:
+    batch, n = a.shape[:2]
+    dtype = np.result_type(a.dtype, np.float32)
+    m = np.asarray(a, dtype=dtype) if overwrite_a else np.array(a, dtype=dtype)
+    perm = np.tile(np.arange(n), (batch, 1))
+    sign = np.ones(batch, dtype=dtype)
+    items = np.arange(batch)
+
+    for k in range(n):
+        # find element with maximum square in every item of the batch
+        swap_index = k + np.argmax(np.abs(m[:, k:, k]), axis=1)
+        swapped = swap_index != k
+
+        m[items, k], m[items, swap_index] = m[items, swap_index], m[items, k].copy()
+        perm[items, k], perm[items, swap_index] = perm[items, swap_index], perm[items, k].copy()
+        sign[swapped] *= -1.0
+
+        # singular items have zeros below the pivot, so they are left untouched
+        pivot = m[:, k, k]
+        pivot = np.where(pivot == 0.0, 1.0, pivot)
+
+        m[:, k + 1 :, k] /= pivot[:, None]
+        m[:, k + 1 :, k + 1 :] -= m[:, k + 1 :, k, None] * m[:, k, None, k + 1 :]
+
+    return BatchLUFactorization(m, perm, sign)
+
+
+def _solve_chunk(a: Matrix, b: Matrix) -> BatchSolution:
+    factorization = batch_lu_decompose(a)
+    det = factorization.det()
+    singular = det == 0.0
+
+    x = factorization.solve(b)
+    x[singular] = np.nan
+
+    return BatchSolution(x, det, singular)
+
+
+def batch_solve_system(a: Matrix, b: Matrix, workers: int | None = None, chunk_size: int = 4096) -> BatchSolution:
+    """
+    Solves the systems `a[i] * x[i] = b[i]` for every item of the batch.
+    Singular items are reported by `singular` (like `check_determinant`
+    does for a single system) and get `nan` as their solution.
+
+    With `workers` set the batch is split into chunks of `chunk_size`
+    items which are solved in a process pool.
+    """
+
+    if workers is None or workers <= 1 or len(a) <= chunk_size:
+        return _solve_chunk(a, b)
+
+    bounds = range(0, len(a), chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_solve_chunk, (a[i : i + chunk_size] for i in bounds), (b[i : i + chunk_size] for i in bounds)))
+
+    return BatchSolution(*(np.concatenate(parts) for parts in zip(*results)))
@@ -0,0 +1,34 @@
+import argparse
+import pathlib
+
+from common.matrix_utils import write_system
+from lab_1 import task_1, task_2
+
+READERS = {
+    "dense": task_1._file_input,
+    "tridiagonal": task_2._file_input,
+}
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert a text system of equations to the binary format")
+    parser.add_argument("-k", "--kind", choices=READERS, default="dense")
+    parser.add_argument("input_file", type=pathlib.Path)
+    parser.add_argument("output_file", type=pathlib.Path)
+    return parser.parse_args()
+
+
+def _main():
+    args = _parse_args()
+    A, b = READERS[args.kind](args.input_file)
+    write_system(args.output_file, A, b)
+
+
+if __name__ == "__main__":
+    try:
+        _main()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"error: {e}")
+        exit(1)
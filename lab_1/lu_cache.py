@@ -0,0 +1,96 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+
+from common.typing import Matrix, Permutation
+from lab_1.task_1 import lu_decompose
+
+Factorization = tuple[Matrix, Matrix, Permutation]
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    max_bytes: int
+    currsize: int
+    nbytes: int
+
+
+class LUCache:
+    """
+    LRU cache of `lu_decompose` results keyed by the content of the matrix.
+    Cached factors are read-only, because they are shared between callers.
+    """
+
+    def __init__(self, maxsize: int = 128, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, Factorization] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(a: Matrix) -> tuple:
+        data = np.ascontiguousarray(a)
+        digest = hashlib.blake2b(data.view(np.uint8).reshape(-1), digest_size=16).digest()
+        return data.shape, data.dtype.str, digest
+
+    @staticmethod
+    def _size(factorization: Factorization) -> int:
+        return sum(x.nbytes for x in factorization)
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.maxsize or self._nbytes > self.max_bytes):
+            _, factorization = self._entries.popitem(last=False)
+            self._nbytes -= self._size(factorization)
+
+    def lu_decompose(self, a: Matrix) -> Factorization:
+        key = self._key(a)
+
+        with self._lock:
+            factorization = self._entries.get(key)
+            if factorization is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return factorization
+            self.misses += 1
+
+        factorization = lu_decompose(a)
+        for x in factorization:
+            x.setflags(write=False)
+
+        size = self._size(factorization)
+        if size > self.max_bytes or self.maxsize <= 0:
+            return factorization
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = factorization
+                self._nbytes += size
+                self._evict()
+
+        return factorization
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, self.max_bytes, len(self._entries), self._nbytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+default_cache = LUCache()
+
+
+def cached_lu_decompose(a: Matrix, cache: LUCache | None = None) -> Factorization:
+    return (cache or default_cache).lu_decompose(a)
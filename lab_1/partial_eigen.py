@@ -0,0 +1,214 @@
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from common.typing import Matrix, Vector
+from lab_1.banded import BandedMatrix
+from lab_1.sparse import CSRMatrix, sparse_lu_factor
+from lab_1.task_1 import lu_factor
+
+MatVec = Callable[[Vector], Vector]
+
+
+class PartialEigenResult(NamedTuple):
+    values: Vector
+    vectors: Matrix
+    iterations: int
+    converged: bool
+
+
+def as_operator(A: Matrix | CSRMatrix | BandedMatrix | MatVec) -> MatVec:
+    if callable(A):
+        return A
+    return lambda x: A @ x
+
+
+def shift_invert_operator(A: Matrix | CSRMatrix, sigma: float) -> MatVec:
+    # eigen values `mu` of (A - sigma * E)^(-1) give `sigma + 1 / mu` of A,
+    # so the values closest to `sigma` become the largest ones
+    n = A.shape[0]
+    if isinstance(A, CSRMatrix):
+        rows, columns, values = A.to_coo()
+        diagonal = np.arange(n)
+        shifted = CSRMatrix.from_coo(np.concatenate([rows, diagonal]), np.concatenate([columns, diagonal]), np.concatenate([values, np.full(n, -sigma)]), A.shape)
+        return sparse_lu_factor(shifted).solve
+    return lu_factor(A - sigma * np.eye(n)).solve
+
+
+def _keys(values: Vector, which: str) -> Vector:
+    # smaller keys are the wanted values
+    return {"LM": -np.abs(values), "LA": -values, "SA": values}[which]
+
+
+def _select(values: Vector, k: int, which: str) -> np.ndarray:
+    return np.argsort(_keys(values, which), kind="stable")[:k]
+
+
+def power_method(A: Matrix | CSRMatrix | BandedMatrix | MatVec, n: int, k: int = 1, eps: float = 1e-10, iterations: int = 1000, x0: Vector | None = None) -> PartialEigenResult:
+    """
+    Power iterations for `k` eigen pairs of the largest magnitude of a
+    symmetric operator; found pairs are deflated (Hotelling) from the next ones.
+    """
+
+    op = as_operator(A)
+    rng = np.random.default_rng(0)
+    values, vectors = np.zeros(k), np.zeros((n, k))
+    converged = True
+    total = 0
+
+    for j in range(k):
+        x = rng.standard_normal(n) if x0 is None or j > 0 else np.array(x0, dtype=np.float64)
+        x /= np.linalg.norm(x)
+        value = 0.0
+        found = False
+
+        for _ in range(iterations):
+            y = op(x) - vectors[:, :j] @ (values[:j] * (vectors[:, :j].T @ x))
+            value = x @ y
+            total += 1
+
+            if np.linalg.norm(y - value * x) <= eps * abs(value):
+                found = True
+                break
+
+            norm = np.linalg.norm(y)
+            if norm == 0.0:
+                found = True
+                break
+            x = y / norm
+
+        values[j], vectors[:, j] = value, x
+        converged = converged and found
+
+    return PartialEigenResult(values, vectors, total, converged)
+
+
+def _converged(beta: float, theta: Vector, S: Matrix, selected: np.ndarray, eps: float) -> bool:
+    residuals = np.abs(beta * S[-1, selected])
+    return bool(np.all(residuals <= eps * np.maximum(np.abs(theta[selected]), eps)))
+
+
+def _lanczos_run(op: MatVec, q: Vector, k: int, m: int, eps: float, which: str, rng: np.random.Generator) -> tuple[Vector, Matrix, int, bool]:
+    n = len(q)
+    Q = np.zeros((n, m + 1))
+    alpha, beta = np.zeros(m), np.zeros(m)
+    Q[:, 0] = q / np.linalg.norm(q)
+    theta, S, selected = np.zeros(0), np.zeros((0, 0)), np.zeros(0, dtype=int)
+    converged = False
+    block_start = 0
+    j = 0
+
+    while j < m:
+        w = op(Q[:, j])
+        alpha[j] = Q[:, j] @ w
+
+        # two passes of Gram-Schmidt keep the basis orthogonal
+        for _ in range(2):
+            w -= Q[:, : j + 1] @ (Q[:, : j + 1].T @ w)
+
+        beta[j] = np.linalg.norm(w)
+        j += 1
+
+        if j >= k or j >= n:
+            T = np.diag(alpha[:j]) + np.diag(beta[: j - 1], 1) + np.diag(beta[: j - 1], -1)
+            theta, S = np.linalg.eigh(T)
+            selected = _select(theta, k, which)
+
+        if j >= n:
+            converged = True
+            break
+
+        # invariant subspace is found (repeated eigen values): its pairs are
+        # exact, but the rest of the space is unexplored, so the basis goes on
+        # with a new block from a random vector orthogonal to it; the pairs
+        # are accepted once such a block gives no better value
+        if beta[j - 1] <= eps:
+            beta[j - 1] = 0.0
+            if block_start >= k:
+                previous = _keys(np.linalg.eigvalsh(T[:block_start, :block_start]), which)
+                block = _keys(np.linalg.eigvalsh(T[block_start:, block_start:]), which)
+                kth = np.sort(previous)[k - 1]
+                converged = bool(block.min() >= kth - eps * max(abs(kth), eps))
+                if converged:
+                    break
+
+            block_start = j
+            w = rng.standard_normal(n)
+            for _ in range(2):
+                w -= Q[:, :j] @ (Q[:, :j].T @ w)
+            w /= np.linalg.norm(w)
+        else:
+            w /= beta[j - 1]
+
+            # pairs of the previous blocks have zero residuals, so the best
+            # pair of the current block has to converge too
+            if j >= k and j > block_start:
+                T_block = T[block_start:, block_start:]
+                block_theta, block_S = np.linalg.eigh(T_block)
+                best = _select(block_theta, 1, which)
+                converged = _converged(beta[j - 1], theta, S, selected, eps) and _converged(beta[j - 1], block_theta, block_S, best, eps)
+
+        if converged:
+            break
+
+        Q[:, j] = w
+
+    return theta[selected], Q[:, :j] @ S[:, selected], j, converged
+
+
+def lanczos(
+    A: Matrix | CSRMatrix | BandedMatrix | MatVec,
+    n: int,
+    k: int = 1,
+    eps: float = 1e-10,
+    iterations: int | None = None,
+    x0: Vector | None = None,
+    which: str = "LM",
+    restarts: int = 20,
+) -> PartialEigenResult:
+    """
+    Lanczos method with full reorthogonalization for `k` eigen pairs of a
+    symmetric operator. `which` selects the values of the largest magnitude
+    ("LM"), the largest ("LA") or the smallest ("SA") ones. Stops when the
+    residuals of the selected Ritz pairs are below `eps` relative to the values.
+
+    The basis is limited by `iterations` vectors; when it's exhausted, the
+    method restarts from the sum of the selected Ritz vectors. `converged`
+    is false if the pairs weren't found within `restarts` restarts.
+    """
+
+    op = as_operator(A)
+    m = min(n, iterations or max(2 * k + 20, 50))
+    rng = np.random.default_rng(0)
+    q = rng.standard_normal(n) if x0 is None else np.array(x0, dtype=np.float64)
+    total = 0
+
+    for _ in range(restarts + 1):
+        values, vectors, steps, converged = _lanczos_run(op, q, k, m, eps, which, rng)
+        total += steps
+        if converged or steps < m:
+            break
+        q = vectors.sum(axis=1)
+
+    return PartialEigenResult(values, vectors, total, converged)
+
+
+METHODS = {
+    "power": power_method,
+    "lanczos": lanczos,
+}
+
+
+def partial_eigen(A: Matrix | CSRMatrix, k: int = 1, sigma: float | None = None, method: str = "lanczos", **options) -> PartialEigenResult:
+    """
+    `k` eigen pairs of the symmetric matrix `A`: the ones of the largest
+    magnitude or, with `sigma`, the ones closest to `sigma` (shift-invert mode
+    on top of the LU factorization of `A - sigma * E`).
+    """
+
+    n = A.shape[0]
+    if sigma is None:
+        return METHODS[method](A, n, k, **options)
+
+    result = METHODS[method](shift_invert_operator(A, sigma), n, k, **options)
+    return result._replace(values=sigma + 1.0 / result.values)
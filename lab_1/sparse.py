@@ -0,0 +1,219 @@
+from collections import deque
+from typing import NamedTuple
+
+import numpy as np
+
+from common.typing import Matrix, Permutation, Vector
+from lab_1.banded import BandedMatrix, BandedLUFactorization, band_lu_factor
+
+
+class CSRMatrix:
+    """
+    Sparse matrix in the compressed sparse row format: the columns and the
+    values of row `i` are `indices[indptr[i]:indptr[i + 1]]` and
+    `data[indptr[i]:indptr[i + 1]]`.
+    """
+
+    def __init__(self, data: Vector, indices: Permutation, indptr: Permutation, shape: tuple[int, int]) -> None:
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = shape
+        self._rows = np.repeat(np.arange(shape[0]), np.diff(indptr))
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    @classmethod
+    def from_coo(cls, rows: Permutation, columns: Permutation, values: Vector, shape: tuple[int, int]) -> "CSRMatrix":
+        # duplicate entries are summed up
+        rows, columns, values = map(np.asarray, (rows, columns, values))
+        order = np.lexsort((columns, rows))
+        rows, columns, values = rows[order], columns[order], values[order]
+
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = (rows[1:] != rows[:-1]) | (columns[1:] != columns[:-1])
+        groups = np.cumsum(first) - 1
+        data = np.bincount(groups, weights=values, minlength=groups[-1] + 1 if len(groups) else 0)
+
+        indptr = np.zeros(shape[0] + 1, dtype=np.intp)
+        np.cumsum(np.bincount(rows[first], minlength=shape[0]), out=indptr[1:])
+        return cls(data, columns[first].astype(np.intp), indptr, shape)
+
+    @classmethod
+    def from_dense(cls, a: Matrix) -> "CSRMatrix":
+        rows, columns = np.nonzero(a)
+        return cls.from_coo(rows, columns, a[rows, columns], a.shape)
+
+    def to_coo(self) -> tuple[Permutation, Permutation, Vector]:
+        return self._rows, self.indices, self.data
+
+    def to_dense(self) -> Matrix:
+        a = np.zeros(self.shape)
+        a[self._rows, self.indices] = self.data
+        return a
+
+    def diagonal(self) -> Vector:
+        d = np.zeros(min(self.shape))
+        mask = self._rows == self.indices
+        d[self._rows[mask]] = self.data[mask]
+        return d
+
+    def permute(self, perm: Permutation) -> "CSRMatrix":
+        # symmetric permutation: row and column `perm[i]` become `i`
+        inverse = np.empty_like(perm)
+        inverse[perm] = np.arange(len(perm))
+        return CSRMatrix.from_coo(inverse[self._rows], inverse[self.indices], self.data, self.shape)
+
+    def __matmul__(self, x: Vector | Matrix) -> Vector | Matrix:
+        products = self.data * x[self.indices].T
+        if products.ndim == 1:
+            return np.bincount(self._rows, weights=products, minlength=self.shape[0])
+        return np.array([np.bincount(self._rows, weights=column, minlength=self.shape[0]) for column in products]).T
+
+
+class IterationResult(NamedTuple):
+    x: Vector
+    iterations: int
+
+
+def _norm(x: Vector) -> float:
+    return np.abs(x).max(initial=0.0)
+
+
+def _check_diagonal(d: Vector) -> None:
+    if np.any(d == 0.0):
+        raise ValueError("diagonal elements can't be zero")
+
+
+def jacobi(A: CSRMatrix, b: Vector, eps: float, iterations: int, x0: Vector | None = None) -> IterationResult:
+    d = A.diagonal()
+    _check_diagonal(d)
+    x = np.zeros(A.shape[0]) if x0 is None else np.array(x0, dtype=np.float64)
+    i = 0
+
+    while i < iterations:
+        # x' = x + D^(-1) * (b - A * x) is one sparse matvec
+        dx = (b - A @ x) / d
+        x += dx
+        i += 1
+        if _norm(dx) <= eps:
+            break
+
+    return IterationResult(x, i)
+
+
+def gauss_seidel(A: CSRMatrix, b: Vector, eps: float, iterations: int, x0: Vector | None = None) -> IterationResult:
+    d = A.diagonal()
+    _check_diagonal(d)
+    x = np.zeros(A.shape[0]) if x0 is None else np.array(x0, dtype=np.float64)
+    data, indices, indptr = A.data, A.indices, A.indptr
+    i = 0
+
+    while i < iterations:
+        difference = 0.0
+
+        for row in range(A.shape[0]):
+            start, stop = indptr[row], indptr[row + 1]
+            dx = (b[row] - data[start:stop] @ x[indices[start:stop]]) / d[row]
+            x[row] += dx
+            difference = max(difference, abs(dx))
+
+        i += 1
+        if difference <= eps:
+            break
+
+    return IterationResult(x, i)
+
+
+def conjugate_gradient(A: CSRMatrix, b: Vector, eps: float, iterations: int, x0: Vector | None = None) -> IterationResult:
+    """
+    Conjugate gradient method for symmetric positive definite `A`.
+    Stops when `||b - A * x|| <= eps * ||b||`.
+    """
+
+    x = np.zeros(A.shape[0]) if x0 is None else np.array(x0, dtype=np.float64)
+    r = b - A @ x
+    p = r.copy()
+    rr = r @ r
+    threshold = (eps * np.linalg.norm(b)) ** 2
+    i = 0
+
+    while i < iterations and rr > threshold:
+        q = A @ p
+        alpha = rr / (p @ q)
+        x += alpha * p
+        r -= alpha * q
+        rr, last_rr = r @ r, rr
+        p = r + (rr / last_rr) * p
+        i += 1
+
+    return IterationResult(x, i)
+
+
+def reverse_cuthill_mckee(A: CSRMatrix) -> Permutation:
+    """
+    Reverse Cuthill-McKee ordering of the symmetrized sparsity pattern:
+    `A.permute(perm)` has its non-zero elements close to the diagonal.
+    """
+
+    n = A.shape[0]
+    rows, columns, _ = A.to_coo()
+    pattern = CSRMatrix.from_coo(np.concatenate([rows, columns]), np.concatenate([columns, rows]), np.ones(2 * A.nnz), A.shape)
+    degree = np.diff(pattern.indptr)
+    indptr, indices = pattern.indptr.tolist(), pattern.indices.tolist()
+
+    visited = [False] * n
+    order = []
+
+    # every component starts from its vertex of the minimal degree
+    for start in np.argsort(degree, kind="stable").tolist():
+        if visited[start]:
+            continue
+        visited[start] = True
+        queue = deque([start])
+
+        while queue:
+            vertex = queue.popleft()
+            order.append(vertex)
+            neighbours = [j for j in indices[indptr[vertex] : indptr[vertex + 1]] if not visited[j]]
+            neighbours.sort(key=lambda j: degree[j])
+            for j in neighbours:
+                visited[j] = True
+            queue.extend(neighbours)
+
+    return np.array(order[::-1], dtype=np.intp)
+
+
+class SparseLUFactorization:
+    def __init__(self, perm: Permutation, factorization: BandedLUFactorization) -> None:
+        self.perm = perm
+        self.factorization = factorization
+
+    def det(self) -> float:
+        # symmetric permutation doesn't change the determinant
+        return self.factorization.det()
+
+    def solve(self, b: Vector | Matrix) -> Vector | Matrix:
+        y = self.factorization.solve(b[self.perm])
+        x = np.empty_like(y)
+        x[self.perm] = y
+        return x
+
+
+def sparse_lu_factor(A: CSRMatrix) -> SparseLUFactorization:
+    """
+    Sparse LU: the matrix is reordered by reverse Cuthill-McKee to narrow
+    its band, then factorized by the band LU with partial pivoting.
+    """
+
+    perm = reverse_cuthill_mckee(A)
+    reordered = A.permute(perm)
+    rows, columns, values = reordered.to_coo()
+    kl = int(max(0, (rows - columns).max(initial=0)))
+    ku = int(max(0, (columns - rows).max(initial=0)))
+
+    ab = np.zeros((kl + ku + 1, A.shape[0]))
+    ab[ku + rows - columns, columns] = values
+    return SparseLUFactorization(perm, band_lu_factor(BandedMatrix(kl, ku, ab)))
@@ -1,123 +1,129 @@
 import argparse
 import pathlib
 import sys
+from functools import cached_property
+from typing import NamedTuple
 
 import numpy as np
 
-from common.matrix_utils import read_matrix, read_vector
-from common.typing import Matrix, Vector
+from common.matrix_utils import is_system_file, open_system, read_matrix, read_vector
+from common.typing import Matrix, Permutation, Vector
 
+BLOCK_SIZE = 64
 
-def forward_step(m: Matrix, k: int) -> tuple[int, int, list[float]]:
-    n = m.shape[0]
-
-    # find element with maximum square to avoid small dividers
-    swap_index = k
-
-    for i in range(k + 1, n):
-        a, b = m[i, k], m[swap_index, k]
-        if a * a > b * b:
-            swap_index = i
 
-    m[[k, swap_index]] = m[[swap_index, k]]
+def _decompose_panel(m: Matrix, perm: np.ndarray, k0: int, k1: int) -> None:
+    for k in range(k0, k1):
+        # find element with maximum square to avoid small dividers
+        swap_index = k + int(np.argmax(np.abs(m[k:, k])))
 
-    if m[k, k] == 0.0:
-        return k, k, []
+        if swap_index != k:
+            m[[k, swap_index]] = m[[swap_index, k]]
+            perm[[k, swap_index]] = perm[[swap_index, k]]
 
-    # convert raws below so that the elements are zero
-    coef = []
+        if m[k, k] == 0.0:
+            continue
 
-    for i in range(k + 1, n):
-        c = m[i, k] / m[k, k]
+        # convert raws below so that the elements in the panel are zero
+        m[k + 1 :, k] /= m[k, k]
+        m[k + 1 :, k + 1 : k1] -= np.outer(m[k + 1 :, k], m[k, k + 1 : k1])
 
-        for j in range(k, n):
-            m[i, j] -= c * m[k, j]
 
-        coef.append(c)
+def _update_trailing(m: Matrix, k0: int, k1: int) -> None:
+    # U12 = L11^(-1) * A12
+    for k in range(k0, k1 - 1):
+        m[k + 1 : k1, k1:] -= np.outer(m[k + 1 : k1, k], m[k, k1:])
 
-    return k, swap_index, coef
+    # A22 = A22 - L21 * U12
+    m[k1:, k1:] -= m[k1:, k0:k1] @ m[k0:k1, k1:]
 
 
-def lu_decompose(a: Matrix) -> tuple[Matrix, Matrix, Matrix]:
+def _factorize(a: Matrix, overwrite_a: bool, block_size: int) -> tuple[Matrix, Permutation]:
     n = a.shape[0]
+    dtype = np.result_type(a.dtype, np.float32)
+    m = np.asarray(a, dtype=dtype) if overwrite_a else np.array(a, dtype=dtype)
+    perm = np.arange(n)
 
-    p = np.eye(n)
-    l = np.eye(n)
-    u = a.copy()
+    for k0 in range(0, n, block_size):
+        k1 = min(k0 + block_size, n)
+        _decompose_panel(m, perm, k0, k1)
+        if k1 < n:
+            _update_trailing(m, k0, k1)
 
-    for k in range(n - 1):
-        *swap, coef = forward_step(u, k)
+    return m, perm
 
-        for i in range(len(coef)):
-            l[i + k + 1, k] = coef[i]
 
-        p[[swap[0], swap[1]]] = p[[swap[1], swap[0]]]
+def lu_decompose(a: Matrix, overwrite_a: bool = False, block_size: int = BLOCK_SIZE) -> tuple[Matrix, Matrix, Permutation]:
+    m, perm = _factorize(a, overwrite_a, block_size)
+    n = m.shape[0]
 
-        for t in range(k):
-            l[swap[0], t], l[swap[1], t] = l[swap[1], t], l[swap[0], t]
+    l = np.tril(m, -1)
+    l[np.diag_indices(n)] = 1.0
+    m[np.tril_indices(n, -1)] = 0.0
 
-    return l, u, p
+    return l, m, perm
 
 
-def solve_with_l(l: Matrix, b: Vector) -> Vector:
+def solve_with_l(l: Matrix, b: Vector | Matrix) -> Vector | Matrix:
     n = l.shape[0]
-    x = np.zeros_like(b)
+    x = np.array(b, dtype=np.result_type(l.dtype, b.dtype))
 
-    for i in range(n):
-        c = b[i]
-        for j in range(i):
-            c -= x[j] * l[i, j]
-        x[i] = c
+    # every column of `b` is substituted at once
+    for i in range(1, n):
+        x[i] -= l[i, :i] @ x[:i]
 
     return x
 
 
-def solve_with_u(u: Matrix, b: Vector) -> Vector:
+def solve_with_u(u: Matrix, b: Vector | Matrix) -> Vector | Matrix:
     n = u.shape[0]
-    x = np.zeros_like(b)
+    x = np.array(b, dtype=np.result_type(u.dtype, b.dtype))
 
     for i in range(n - 1, -1, -1):
-        c = b[i]
-        for j in range(i + 1, n):
-            c -= x[j] * u[i, j]
-        x[i] = c / u[i, i]
+        x[i] -= u[i, i + 1 :] @ x[i + 1 :]
+        x[i] /= u[i, i]
 
     return x
 
 
-def solve_system(l: Matrix, u: Matrix, p: Matrix, b: Vector) -> Vector:
-    z = solve_with_l(l, np.dot(p, b))
+def permutation_matrix(p: Permutation) -> Matrix:
+    return np.eye(len(p))[p]
+
+
+def _as_permutation(p: Permutation | Matrix) -> Permutation:
+    # dense permutation matrices are still accepted for backward compatibility
+    if p.ndim == 2:
+        return np.argmax(p, axis=1)
+    return p
+
+
+def solve_system(l: Matrix, u: Matrix, p: Permutation | Matrix, b: Vector | Matrix) -> Vector | Matrix:
+    z = solve_with_l(l, b[_as_permutation(p)])
     x = solve_with_u(u, z)
     return x
 
 
-def count_permutation_determinant(p: Matrix) -> float:
-    n = p.shape[0]
-    indexes = np.zeros(n, dtype=int)
+def count_permutation_determinant(p: Permutation | Matrix) -> float:
+    indexes = _as_permutation(p).tolist()
+    visited = [False] * len(indexes)
     d = 1.0
 
-    for i in range(n):
-        for j in range(n):
-            if p[i, j] == 1.0:
-                indexes[i] = j
-
-    for i in range(n):
-        k = 0
+    # every cycle of even length changes the sign
+    for i in range(len(indexes)):
+        j, length = i, 0
 
-        for j in range(i, n):
-            if indexes[j] == i:
-                k = j
-                break
+        while not visited[j]:
+            visited[j] = True
+            j = indexes[j]
+            length += 1
 
-        indexes[[i, k]] = indexes[[k, i]]
-
-        if k != i:
+        if length % 2 == 0 and length > 0:
             d *= -1.0
 
     return d
 
 
-def determinant(l: Matrix, u: Matrix, p: Matrix) -> float:
+def determinant(l: Matrix, u: Matrix, p: Permutation | Matrix) -> float:
     d = 1.0
     n = l.shape[0]
 
@@ -127,17 +133,131 @@ def determinant(l: Matrix, u: Matrix, p: Matrix) -> float:
     return count_permutation_determinant(p) * d
 
 
-def inverse_matrix(l: Matrix, u: Matrix, p: Matrix) -> Matrix:
+def inverse_matrix(l: Matrix, u: Matrix, p: Permutation | Matrix) -> Matrix:
     n = l.shape[0]
-    xs = []
-    b = np.zeros(n)
+    return solve_system(l, u, p, np.eye(n, dtype=u.dtype))
 
-    for i in range(n):
-        b[i] = 1.0
-        xs.append(solve_system(l, u, p, b))
-        b[i] = 0.0
 
-    return np.array(xs).T
+class LUFactorization:
+    """
+    LU decomposition stored in a single buffer: multipliers of `L` below
+    the diagonal (its unit diagonal is implied) and `U` on and above it.
+    """
+
+    def __init__(self, lu: Matrix, perm: Permutation) -> None:
+        self.lu = lu
+        self.perm = perm
+
+    @cached_property
+    def L(self) -> Matrix:
+        l = np.tril(self.lu, -1)
+        l[np.diag_indices(self.n)] = 1.0
+        return l
+
+    @cached_property
+    def U(self) -> Matrix:
+        return np.triu(self.lu)
+
+    @property
+    def n(self) -> int:
+        return self.lu.shape[0]
+
+    def solve(self, b: Vector | Matrix) -> Vector | Matrix:
+        return solve_system(self.lu, self.lu, self.perm, b)
+
+    def det(self) -> float:
+        return determinant(self.lu, self.lu, self.perm)
+
+    def inverse(self) -> Matrix:
+        return inverse_matrix(self.lu, self.lu, self.perm)
+
+    def solve_transposed(self, b: Vector | Matrix) -> Vector | Matrix:
+        # A^T = U^T * L^T * P, so the triangles are walked in reverse order
+        lu = self.lu
+        n = self.n
+        z = np.array(b, dtype=np.result_type(lu.dtype, b.dtype))
+
+        for i in range(n):
+            z[i] -= lu[:i, i] @ z[:i]
+            z[i] /= lu[i, i]
+
+        for i in range(n - 2, -1, -1):
+            z[i] -= lu[i + 1 :, i] @ z[i + 1 :]
+
+        x = np.empty_like(z)
+        x[self.perm] = z
+        return x
+
+
+def lu_factor(a: Matrix, overwrite_a: bool = False, block_size: int = BLOCK_SIZE) -> LUFactorization:
+    return LUFactorization(*_factorize(a, overwrite_a, block_size))
+
+
+class RefinedSolution(NamedTuple):
+    x: Vector
+    condition: float
+    iterations: int
+
+
+def estimate_condition(a: Matrix, factorization: LUFactorization, max_iterations: int = 5) -> float:
+    """
+    Hager/Higham estimate of the condition number `||A||_1 * ||A^(-1)||_1`,
+    which needs only a few solves with already computed factors.
+    """
+
+    n = factorization.n
+    x = np.full(n, 1.0 / n)
+    inverse_norm = 0.0
+
+    for k in range(max_iterations):
+        y = factorization.solve(x)
+        inverse_norm = np.abs(y).sum()
+        z = factorization.solve_transposed(np.where(y >= 0.0, 1.0, -1.0))
+        j = int(np.argmax(np.abs(z)))
+
+        if k > 0 and abs(z[j]) <= z @ x:
+            break
+
+        x = np.zeros(n)
+        x[j] = 1.0
+
+    # alternating vector protects from the cases where the estimate is too rough
+    x = np.array([(-1.0) ** i * (1.0 + i / max(n - 1, 1)) for i in range(n)])
+    inverse_norm = max(inverse_norm, 2.0 * np.abs(factorization.solve(x)).sum() / (3.0 * n))
+
+    return np.abs(a).sum(axis=0).max() * inverse_norm
+
+
+def refine_solve_system(a: Matrix, b: Vector | Matrix, eps: float = 1e-12, iterations: int = 10, factor_dtype: type = np.float32) -> RefinedSolution:
+    """
+    Solves `A * x = b` factorizing `A` in the lower precision `factor_dtype`
+    and refining the solution with residuals computed in `float64`.
+    Refinement stops when the correction is below `eps` (relative to `x`)
+    or stops decreasing.
+    """
+
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    factorization = lu_factor(a.astype(factor_dtype), overwrite_a=True)
+    x = factorization.solve(b).astype(np.float64)
+    last_norm = np.inf
+    i = 0
+
+    while i < iterations:
+        dx = factorization.solve(b - a @ x).astype(np.float64)
+        dx_norm = np.abs(dx).max(initial=0.0)
+
+        if dx_norm >= last_norm:
+            break
+
+        x += dx
+        last_norm = dx_norm
+        i += 1
+
+        if dx_norm <= eps * np.abs(x).max(initial=0.0):
+            break
+
+    return RefinedSolution(x, estimate_condition(a, factorization), i)
 
 
 def print_matrix(matrix: Matrix) -> None:
@@ -172,6 +292,9 @@ def _dialog_input():
 
 
 def _file_input(path: pathlib.Path):
+    if is_system_file(path):
+        return open_system(path)
+
     with path.open("r", encoding="utf-8") as file:
         n = int(file.readline().strip())
         A = read_matrix(n, n, file)
@@ -199,7 +322,7 @@ def _main():
     print("U:")
     print_matrix(u)
     print("Permuation matrix:")
-    print_matrix(p)
+    print_matrix(permutation_matrix(p))
 
     print()
     print(f"Solution x: {x}")
@@ -215,7 +338,7 @@ def _main():
     print("L * U:")
     print_matrix(np.matmul(l, u))
     print("P * A:")
-    print_matrix(np.matmul(p, A))
+    print_matrix(A[p])
     print(f"A * x = {np.matmul(A, x.T).T}")
     print("A * (A ^ (-1)):")
     print_matrix(np.matmul(A, inversed))
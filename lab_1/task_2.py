@@ -1,50 +1,333 @@
 import argparse
 import pathlib
 import sys
-from typing import TextIO
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import NamedTuple, TextIO
 
 import numpy as np
+from numpy.typing import NDArray
 
-from common.matrix_utils import read_matrix
+from common.matrix_utils import is_system_file, open_system, read_matrix, read_row
 from common.typing import Matrix, Vector
+from lab_1 import task_1
+
+
+def run_coefficients(a: Vector, b: Vector, c: Vector, d: Vector) -> tuple[list[float], list[float]]:
+    # the recurrence is sequential, so it runs on plain floats which is
+    # much cheaper than indexing numpy arrays element by element
+    a, b, c, d = (np.asarray(x, dtype=np.float64).tolist() for x in (a, b, c, d))
+    n = len(b)
+    p, q = [0.0] * n, [0.0] * n
+    p_last = q_last = 0.0
+
+    for i in range(n):
+        # `a[0]` is multiplied by zero coefficients, so it is ignored
+        t = b[i] + a[i] * p_last
+        if t == 0.0:
+            raise ValueError("Can't find solution of system")
+        p_last = p[i] = -c[i] / t
+        q_last = q[i] = (d[i] - a[i] * q_last) / t
+
+    return p, q
+
+
+def solve_using_run_coefficients(p: list[float], q: list[float]) -> Vector:
+    n = len(p)
+    x = [0.0] * n
+    x_last = 0.0
+
+    for i in range(n - 1, -1, -1):
+        x_last = x[i] = p[i] * x_last + q[i]
+
+    return np.array(x)
+
+
+def tridiagonal_solve(a: Vector, b: Vector, c: Vector, d: Vector) -> Vector:
+    """
+    Solves a tridiagonal system given by its sub-diagonal `a`, diagonal `b`,
+    super-diagonal `c` and free coefficients `d` (all of length `n`)
+    """
+
+    return solve_using_run_coefficients(*run_coefficients(a, b, c, d))
 
 
 def calculate_run_coefficients(A: Matrix, B: Matrix) -> Matrix:
+    return np.column_stack(run_coefficients(A[:, 0], A[:, 1], A[:, 2], np.ravel(B)))
+
+
+def solve_using_coefficients(run_coefs: Matrix) -> Vector:
+    return solve_using_run_coefficients(run_coefs[:, 0].tolist(), run_coefs[:, 1].tolist())
+
+
+def solve_periodic_system(A: Matrix, b: Matrix) -> Vector:
+    """
+    Solves a cyclic tridiagonal system. `A` has the usual `(n, 3)` form,
+    but `A[0, 0]` is the coefficient of `x[n - 1]` in the first equation
+    and `A[n - 1, 2]` is the coefficient of `x[0]` in the last one.
+
+    The corners are moved into a rank-1 correction (Sherman-Morrison),
+    so the system is solved by two ordinary sweeps.
+    """
+
     n = A.shape[0]
-    result = np.zeros((n, 2))
+    if n < 3:
+        raise ValueError("cyclic system must have at least 3 equations")
+
+    a, diagonal, c = (np.array(A[:, i], dtype=np.float64) for i in range(3))
+    d = np.ravel(b)
+    top, bottom = a[0], c[-1]
+    gamma = -diagonal[0] if diagonal[0] != 0.0 else -1.0
+
+    diagonal[0] -= gamma
+    diagonal[-1] -= bottom * top / gamma
+
+    u = np.zeros(n)
+    u[0], u[-1] = gamma, bottom
+
+    y = tridiagonal_solve(a, diagonal, c, d)
+    z = tridiagonal_solve(a, diagonal, c, u)
+
+    denominator = 1.0 + z[0] + top * z[-1] / gamma
+    if denominator == 0.0:
+        raise ValueError("Can't find solution of system")
+
+    return y - (y[0] + top * y[-1] / gamma) / denominator * z
+
+
+def solve_block_system(A: Matrix, B: Matrix, C: Matrix, d: Matrix) -> Matrix:
+    """
+    Block version of the run method. `A`, `B` and `C` are the sub-diagonal,
+    diagonal and super-diagonal blocks of shape `(n, m, m)`, `d` is the
+    free coefficients of shape `(n, m)`. Every reduced diagonal block is
+    factorized once and reused for both run coefficients.
+    """
+
+    n = B.shape[0]
+    P, Q = np.zeros(C.shape), np.zeros(np.shape(d))
 
     for i in range(n):
-        a, b, c, d = *A[i, :3], B[i, 0]
+        D, f = B[i], d[i]
+        if i > 0:
+            D = D + A[i] @ P[i - 1]
+            f = f - A[i] @ Q[i - 1]
 
-        if i == 0:
-            if d == 0.0:
-                raise ValueError("Can't find solution of system")
-            result[i, :] = -c / b, d / b
+        factorization = task_1.lu_factor(D)
+        if factorization.det() == 0.0:
+            raise ValueError("Can't find solution of system")
 
-        else:
-            p_last, q_last = result[i - 1, :]
-            t = b + a * p_last
-            if t == 0.0:
-                raise ValueError("Can't find solution of system")
-            result[i, :] = -c / t, (d - a * q_last) / t
+        P[i] = -factorization.solve(C[i])
+        Q[i] = factorization.solve(f)
 
-    return result
+    x = np.zeros_like(Q)
+    x[n - 1] = Q[n - 1]
+    for i in range(n - 2, -1, -1):
+        x[i] = P[i] @ x[i + 1] + Q[i]
 
+    return x
 
-def solve_using_coefficients(run_coefs: Matrix) -> Vector:
-    n = run_coefs.shape[0]
-    result = np.zeros(n)
 
-    result[n - 1] = run_coefs[n - 1, 1]
-    for i in range(0, n - 1)[::-1]:
-        result[i] = run_coefs[i, 0] * result[i + 1] + run_coefs[i, 1]
+class BatchSolution(NamedTuple):
+    x: Matrix
+    singular: NDArray[np.bool_]
+
+
+def batch_tridiagonal_solve(a: Matrix, b: Matrix, c: Matrix, d: Matrix) -> BatchSolution:
+    """
+    Solves a batch of tridiagonal systems given by diagonals of shape
+    `(batch, n)`. The sweep is vectorized across the batch, and the systems
+    where it meets a zero pivot are flagged in `singular` (their `x` is `nan`)
+    instead of failing the whole batch.
+    """
+
+    # `(n, batch)` layout keeps every step of the sweep contiguous
+    a, b, c, d = (np.ascontiguousarray(np.asarray(x, dtype=np.float64).T) for x in (a, b, c, d))
+    n, batch = b.shape
+    p, q = np.empty((n, batch)), np.empty((n, batch))
+    p_last, q_last = np.zeros(batch), np.zeros(batch)
+    singular = np.zeros(batch, dtype=bool)
+
+    for i in range(n):
+        t = b[i] + a[i] * p_last
+        zero = t == 0.0
+        if zero.any():
+            singular |= zero
+            t[zero] = np.nan
+        p_last = p[i] = -c[i] / t
+        q_last = q[i] = (d[i] - a[i] * q_last) / t
 
-    return result
+    x = np.empty((n, batch))
+    x_last = np.zeros(batch)
 
+    for i in range(n - 1, -1, -1):
+        x_last = x[i] = p[i] * x_last + q[i]
 
-def solve_system(A: Matrix, b: Matrix) -> Vector:
-    run_coefs = calculate_run_coefficients(A, b)
-    return solve_using_coefficients(run_coefs)
+    x = x.T
+    x[singular] = np.nan
+    return BatchSolution(x, singular)
+
+
+def batch_solve_system(A: Matrix, b: Matrix) -> BatchSolution:
+    """
+    Batched version of `solve_system`: `A` has shape `(batch, n, 3)`
+    and `b` has shape `(batch, n)` or `(batch, n, 1)`.
+    """
+
+    return batch_tridiagonal_solve(A[..., 0], A[..., 1], A[..., 2], np.reshape(b, A.shape[:2]))
+
+
+def _diagonals(a: Vector, b: Vector, c: Vector, d: Vector) -> tuple[Vector, Vector, Vector, Vector]:
+    a, b, c, d = (np.array(x, dtype=np.float64) for x in (a, b, c, d))
+    a[0] = c[-1] = 0.0
+    return a, b, c, d
+
+
+def _cyclic_reduction(a: Vector, b: Vector, c: Vector, d: Vector) -> Vector:
+    n = len(b)
+    if n <= 2:
+        return tridiagonal_solve(a, b, c, d)
+
+    # identity equation at the end keeps every odd row between two even ones
+    if n % 2 == 0:
+        a, b, c, d = (np.append(x, value) for x, value in zip((a, b, c, d), (0.0, 1.0, 0.0, 0.0)))
+
+    if np.any(b[::2] == 0.0):
+        raise ValueError("Can't find solution of system")
+
+    # odd equations absorb their even neighbours, so the odd unknowns form
+    # a twice smaller tridiagonal system
+    alpha = -a[1::2] / b[:-1:2]
+    beta = -c[1::2] / b[2::2]
+
+    x = np.zeros(len(b))
+    x[1::2] = _cyclic_reduction(
+        alpha * a[:-1:2],
+        b[1::2] + alpha * c[:-1:2] + beta * a[2::2],
+        beta * c[2::2],
+        d[1::2] + alpha * d[:-1:2] + beta * d[2::2],
+    )
+
+    # even unknowns are restored from their own equations
+    x_prev = np.concatenate([[0.0], x[1::2]])
+    x_next = np.concatenate([x[1::2], [0.0]])
+    x[::2] = (d[::2] - a[::2] * x_prev - c[::2] * x_next) / b[::2]
+
+    return x[:n]
+
+
+def cyclic_reduction_solve(a: Vector, b: Vector, c: Vector, d: Vector) -> Vector:
+    """
+    Solves a tridiagonal system by cyclic reduction: `log2(n)` levels,
+    each of them is a vectorized operation over the whole level.
+    Doesn't pivot, so it's meant for diagonally dominant systems.
+    """
+
+    return _cyclic_reduction(*_diagonals(a, b, c, d))
+
+
+def _solve_partitions(a: Matrix, b: Matrix, c: Matrix, d: Matrix) -> tuple[Matrix, Matrix, Matrix]:
+    # every partition is solved for its free coefficients and for both
+    # spikes (couplings with the left and the right separators) at once
+    k, m = b.shape
+    v, w = np.zeros((k, m)), np.zeros((k, m))
+    v[:, 0] = a[:, 0]
+    w[:, -1] = c[:, -1]
+
+    x, singular = batch_tridiagonal_solve(np.tile(a, (3, 1)), np.tile(b, (3, 1)), np.tile(c, (3, 1)), np.concatenate([d, v, w]))
+    if singular.any():
+        raise ValueError("Can't find solution of system")
+
+    return x[:k], x[k : 2 * k], x[2 * k :]
+
+
+def _solve_shared_partitions(input_name: str, output_name: str, k: int, m: int, start: int, stop: int) -> None:
+    input_memory = shared_memory.SharedMemory(name=input_name)
+    output_memory = shared_memory.SharedMemory(name=output_name)
+
+    try:
+        a, b, c, d = np.ndarray((4, k, m + 1), buffer=input_memory.buf)[:, start:stop, :m]
+        y, v, w = _solve_partitions(a, b, c, d)
+        output = np.ndarray((3, k, m), buffer=output_memory.buf)
+        output[0, start:stop], output[1, start:stop], output[2, start:stop] = y, v, w
+        del a, b, c, d, output
+    finally:
+        input_memory.close()
+        output_memory.close()
+
+
+def _solve_partitions_in_pool(diagonals: Matrix, workers: int) -> tuple[Matrix, Matrix, Matrix]:
+    _, k, m = diagonals.shape
+    m -= 1
+    input_memory = shared_memory.SharedMemory(create=True, size=diagonals.nbytes)
+    output_memory = shared_memory.SharedMemory(create=True, size=3 * k * m * 8)
+
+    try:
+        np.ndarray(diagonals.shape, buffer=input_memory.buf)[:] = diagonals
+        bounds = np.linspace(0, k, min(workers, k) + 1).astype(int)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_solve_shared_partitions, input_memory.name, output_memory.name, k, m, start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+            for future in futures:
+                future.result()
+
+        y, v, w = np.ndarray((3, k, m), buffer=output_memory.buf).copy()
+        return y, v, w
+    finally:
+        input_memory.close()
+        input_memory.unlink()
+        output_memory.close()
+        output_memory.unlink()
+
+
+def partitioned_solve(a: Vector, b: Vector, c: Vector, d: Vector, partitions: int | None = None, workers: int | None = None) -> Vector:
+    """
+    SPIKE-like partitioned solver. The system is split into `partitions`
+    blocks divided by single separator rows. The blocks are solved
+    independently (vectorized, or split across `workers` processes
+    with shared memory buffers), then a small tridiagonal system for
+    the separators couples them together.
+    """
+
+    a, b, c, d = _diagonals(a, b, c, d)
+    n = len(b)
+    k = partitions or max(1, int(np.sqrt(n)))
+    m = max(1, -(-(n - k + 1) // k))
+
+    # pad with identity equations up to `k` blocks of `m` rows plus separator
+    size = k * (m + 1)
+    diagonals = np.zeros((4, size))
+    diagonals[1, n:] = 1.0
+    diagonals[:, :n] = a, b, c, d
+    diagonals = diagonals.reshape(4, k, m + 1)
+
+    if workers is None or workers <= 1:
+        y, v, w = _solve_partitions(*diagonals[:, :, :m])
+    else:
+        y, v, w = _solve_partitions_in_pool(diagonals, workers)
+
+    a_s, b_s, c_s, d_s = diagonals[:, :-1, m]
+    separators = tridiagonal_solve(
+        -a_s * v[:-1, -1],
+        b_s - a_s * w[:-1, -1] - c_s * v[1:, 0],
+        -c_s * w[1:, 0],
+        d_s - a_s * y[:-1, -1] - c_s * y[1:, 0],
+    )
+
+    x = np.zeros((k, m + 1))
+    x[:, :m] = y - v * np.concatenate([[0.0], separators])[:, None] - w * np.concatenate([separators, [0.0]])[:, None]
+    x[:-1, m] = separators
+    return x.reshape(-1)[:n]
+
+
+METHODS = {
+    "thomas": tridiagonal_solve,
+    "cyclic_reduction": cyclic_reduction_solve,
+    "partitioned": partitioned_solve,
+}
+
+
+def solve_system(A: Matrix, b: Matrix, method: str = "thomas", **options) -> Vector:
+    return METHODS[method](A[:, 0], A[:, 1], A[:, 2], np.ravel(b), **options)
 
 
 # user interface
@@ -54,14 +337,12 @@ def _read_tridiagonal_matrix(n: int, input_stream: TextIO) -> Matrix:
     a = np.zeros((n, 3))
 
     for i in range(n):
-        values = list(map(float, input_stream.readline().split()))
-
         if i == 0:
-            a[i, 1:] = values
+            read_row(input_stream, a[i, 1:])
         elif i == n - 1:
-            a[i, :2] = values
+            read_row(input_stream, a[i, :2])
         else:
-            a[i, :] = values
+            read_row(input_stream, a[i, :])
 
     return a
 
@@ -83,7 +364,7 @@ def _dialog_input():
     n = _read_number_of_equations()
 
     print("Enter tridiagonal matrix's coefficients (matrix A):")
-    A = _read_tridiagonal_matrix(n)
+    A = _read_tridiagonal_matrix(n, sys.stdin)
 
     print("Enter free coefficients (vector b):")
     b = read_matrix(1, n, sys.stdin).T
@@ -92,6 +373,9 @@ def _dialog_input():
 
 
 def _file_input(path: pathlib.Path):
+    if is_system_file(path):
+        return open_system(path)
+
     with path.open("r", encoding="utf-8") as file:
         n = int(file.readline().strip())
         A = _read_tridiagonal_matrix(n, file)
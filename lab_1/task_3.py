@@ -0,0 +1,186 @@
+import argparse
+import math
+import pathlib
+import sys
+from typing import NamedTuple
+
+import numpy as np
+
+from common.matrix_utils import is_system_file, open_system, read_matrix, read_vector
+from common.typing import Matrix, Vector
+from lab_1.task_1 import solve_with_l
+
+BLOCK_SIZE = 64
+
+
+class IterativeMethodResult(NamedTuple):
+    x: Vector
+    iterations: int
+    history: list[float]
+
+
+def norm(m: Matrix | Vector) -> float:
+    return float(np.sqrt(np.sum(m * m)))
+
+
+def jacobi_coefficients(A: Matrix, b: Vector) -> tuple[Matrix, Vector]:
+    d = np.diagonal(A)
+    if np.any(d == 0.0):
+        raise ValueError("diagonal elements can't be zero")
+
+    alpha = -A / d[:, None]
+    alpha[np.diag_indices_from(alpha)] = 0.0
+    beta = b / d
+    return alpha, beta
+
+
+def estimate_iterations(alpha: Matrix, beta: Vector, eps: float) -> int | None:
+    # a priori estimate from ||x^k - x|| <= ||alpha||^k / (1 - ||alpha||) * ||beta||
+    alpha_norm, beta_norm = norm(alpha), norm(beta)
+    if alpha_norm >= 1.0:
+        return None
+    if alpha_norm == 0.0 or beta_norm == 0.0:
+        return 1
+    k = (math.log(eps) - math.log(beta_norm) + math.log(1.0 - alpha_norm)) / math.log(alpha_norm)
+    return max(1, math.ceil(k))
+
+
+def _error_coefficient(numerator: float, alpha_norm: float) -> float:
+    # without ||alpha|| < 1 the estimate doesn't hold, so only the difference is used
+    if alpha_norm >= 1.0:
+        return 1.0
+    return numerator / (1.0 - alpha_norm)
+
+
+def jacobi_method(alpha: Matrix, beta: Vector, eps: float, iterations: int = 1000, x0: Vector | None = None) -> IterativeMethodResult:
+    coef = _error_coefficient(norm(alpha), norm(alpha))
+    x = np.array(beta if x0 is None else x0, dtype=np.float64)
+    history = []
+
+    while len(history) < iterations:
+        # one sweep is a single matrix-vector product
+        x2 = alpha @ x + beta
+        history.append(coef * norm(x2 - x))
+        x = x2
+
+        if history[-1] <= eps:
+            break
+
+    return IterativeMethodResult(x, len(history), history)
+
+
+def _seidel_blocks(alpha: Matrix, block_size: int) -> list[tuple[int, int, Matrix, Matrix]]:
+    # inside a block the new values are found with (E - B)^(-1),
+    # where B is the strictly lower part of the block
+    n = alpha.shape[0]
+    blocks = []
+
+    for k0 in range(0, n, block_size):
+        k1 = min(k0 + block_size, n)
+        rows = alpha[k0:k1].copy()
+        lower = np.tril(rows[:, k0:k1], -1)
+        rows[:, k0:k1] -= lower
+        blocks.append((k0, k1, rows, solve_with_l(-lower, np.eye(k1 - k0))))
+
+    return blocks
+
+
+def seidel_method(alpha: Matrix, beta: Vector, eps: float, iterations: int = 1000, x0: Vector | None = None, block_size: int = BLOCK_SIZE) -> IterativeMethodResult:
+    """
+    Seidel method: every unknown is computed from the already updated ones.
+    Rows are processed by blocks, so a sweep is a few matrix-vector products
+    instead of a loop over the elements, while the iterations are the same.
+    """
+
+    coef = _error_coefficient(norm(np.triu(alpha)), norm(alpha))
+    blocks = _seidel_blocks(alpha, block_size)
+    x = np.array(beta if x0 is None else x0, dtype=np.float64)
+    history = []
+
+    while len(history) < iterations:
+        last_x = x.copy()
+
+        for k0, k1, rows, inversed in blocks:
+            x[k0:k1] = inversed @ (rows @ x + beta[k0:k1])
+
+        history.append(coef * norm(x - last_x))
+
+        if history[-1] <= eps:
+            break
+
+    return IterativeMethodResult(x, len(history), history)
+
+
+METHODS = {
+    "jacobi": jacobi_method,
+    "seidel": seidel_method,
+}
+
+
+# user interface
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-i", "--input-file", type=pathlib.Path, default=None)
+    parser.add_argument("-m", "--method", choices=METHODS, default="jacobi")
+    parser.add_argument("-e", "--eps", type=float, default=0.0001)
+    return parser.parse_args()
+
+
+def _dialog_input():
+    n = int(input("Enter number of equations: "))
+    if n <= 0:
+        raise ValueError("number can't be zero o negative")
+
+    print("Enter matrix A:")
+    A = read_matrix(n, n, sys.stdin)
+
+    print("Enter vector b:")
+    b = read_vector(n, sys.stdin)
+
+    return A, b
+
+
+def _file_input(path: pathlib.Path):
+    if is_system_file(path):
+        return open_system(path)
+
+    with path.open("r", encoding="utf-8") as file:
+        n = int(file.readline().strip())
+        A = read_matrix(n, n, file)
+        b = read_vector(n, file)
+        return A, b
+
+
+def _main():
+    args = _parse_args()
+
+    if args.eps <= 0.0:
+        raise ValueError("accuracy can't be zero o negative")
+
+    if args.input_file is None:
+        A, b = _dialog_input()
+    else:
+        A, b = _file_input(args.input_file)
+
+    alpha, beta = jacobi_coefficients(A, b)
+    estimate = estimate_iterations(alpha, beta, args.eps)
+    result = METHODS[args.method](alpha, beta, args.eps)
+
+    print(f"Result: {result.x}")
+    print(f"Iterations: {result.iterations}")
+    if estimate is None:
+        print("A priori estimate: ||alpha|| >= 1, convergence isn't guaranteed")
+    else:
+        print(f"A priori estimate: {estimate}")
+
+
+if __name__ == "__main__":
+    try:
+        _main()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"error: {e}")
+        exit(1)
@@ -0,0 +1,172 @@
+import argparse
+import math
+import pathlib
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+
+from common.matrix_utils import read_matrix
+from common.typing import Matrix, Vector
+
+
+@dataclass
+class EigenTaskResult:
+    iterations: int
+    eigen_values: list[float]
+    eigen_vectors: list[Vector]
+
+
+def off_diagonal_norm(A: Matrix) -> float:
+    upper = np.triu(A, 1)
+    return float(np.sqrt(np.sum(upper * upper)))
+
+
+def rotation_angle(A: Matrix, i: int, j: int) -> float:
+    aii, ajj, aij = A[i, i], A[j, j], A[i, j]
+    if aii == ajj:
+        return math.pi / 4.0
+    return 0.5 * math.atan(2.0 * aij / (aii - ajj))
+
+
+def rotate(A: Matrix, U: Matrix, i: int, j: int) -> None:
+    # A = U^T * A * U and U = U * R touch only rows and columns `i` and `j`
+    phi = rotation_angle(A, i, j)
+    c, s = math.cos(phi), math.sin(phi)
+
+    col_i, col_j = A[:, i].copy(), A[:, j]
+    A[:, i] = c * col_i + s * col_j
+    A[:, j] = c * col_j - s * col_i
+
+    row_i, row_j = A[i].copy(), A[j]
+    A[i] = c * row_i + s * row_j
+    A[j] = c * row_j - s * row_i
+    A[i, j] = A[j, i] = 0.0
+
+    col_i, col_j = U[:, i].copy(), U[:, j]
+    U[:, i] = c * col_i + s * col_j
+    U[:, j] = c * col_j - s * col_i
+
+
+def _max_element_rotations(A: Matrix, U: Matrix, eps: float) -> int:
+    iterations = 0
+    upper = np.triu_indices(A.shape[0], 1)
+
+    while off_diagonal_norm(A) > eps:
+        k = int(np.argmax(np.abs(A[upper])))
+        rotate(A, U, upper[0][k], upper[1][k])
+        iterations += 1
+
+    return iterations
+
+
+def _cyclic_rotations(A: Matrix, U: Matrix, eps: float) -> int:
+    n = A.shape[0]
+    iterations = 0
+    sweep = 0
+
+    while (norm := off_diagonal_norm(A)) > eps:
+        # small elements are skipped during the first sweeps
+        threshold = 0.2 * norm / (n * n) if sweep < 3 else 0.0
+
+        for i in range(n - 1):
+            for j in range(i + 1, n):
+                if abs(A[i, j]) > threshold:
+                    rotate(A, U, i, j)
+                    iterations += 1
+
+        sweep += 1
+
+    return iterations
+
+
+STRATEGIES = {
+    "max": _max_element_rotations,
+    "cyclic": _cyclic_rotations,
+}
+
+
+def solve_eigen_task(M: Matrix, eps: float, strategy: str = "cyclic") -> EigenTaskResult:
+    """
+    Rotation (Jacobi) method for a symmetric matrix. `strategy` chooses
+    which element is annihilated next: the maximal one (as in
+    `lab-1/task_4`) or every element in cyclic sweeps.
+    """
+
+    A = np.array(M, dtype=np.float64)
+    n = A.shape[0]
+    U = np.eye(n)
+
+    iterations = STRATEGIES[strategy](A, U, eps) if n > 1 else 0
+
+    return EigenTaskResult(
+        iterations=iterations,
+        eigen_values=list(np.diagonal(A)),
+        eigen_vectors=[U[:, i].copy() for i in range(n)],
+    )
+
+
+# user interface
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-i", "--input-file", type=pathlib.Path, default=None)
+    parser.add_argument("-e", "--eps", type=float, default=0.0001)
+    parser.add_argument("--strategy", choices=STRATEGIES, default="cyclic")
+    parser.add_argument("-s", "--stats", type=float, nargs=3, metavar=("START", "END", "STEP"), default=None)
+    return parser.parse_args()
+
+
+def _read_matrix(input_stream) -> Matrix:
+    n = int(input_stream.readline().strip())
+    if n <= 0:
+        raise ValueError("matrix size can't be negative or zero")
+    return read_matrix(n, n, input_stream)
+
+
+def _dialog_input() -> Matrix:
+    print("Enter matrix size and matrix A:")
+    return _read_matrix(sys.stdin)
+
+
+def _file_input(path: pathlib.Path) -> Matrix:
+    with path.open("r", encoding="utf-8") as file:
+        return _read_matrix(file)
+
+
+def _print_result(result: EigenTaskResult) -> None:
+    print(f"iterations: {result.iterations}")
+    print("eigen values: " + " ".join(f"{value:.3f}" for value in result.eigen_values))
+    print("eigen vectors:")
+    for i, vector in enumerate(result.eigen_vectors):
+        print(f"x{i}: " + " ".join(f"{value:.5f}" for value in vector))
+
+
+def _main():
+    args = _parse_args()
+    A = _dialog_input() if args.input_file is None else _file_input(args.input_file)
+
+    if args.stats is None:
+        if args.eps < 0.0:
+            raise ValueError("precision can't be a negativ value")
+        _print_result(solve_eigen_task(A, args.eps, args.strategy))
+        return
+
+    start, end, step = args.stats
+    if min(start, end, step) < 0.0:
+        raise ValueError("range values can't be negative")
+
+    print(f"{'precision':<15} | {'iterations':<15}")
+    for eps in np.arange(start, end + step / 2.0, step):
+        print(f"{eps:<15.6f} | {solve_eigen_task(A, eps, args.strategy).iterations:<15}")
+
+
+if __name__ == "__main__":
+    try:
+        _main()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"error: {e}")
+        exit(1)
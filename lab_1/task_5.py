@@ -0,0 +1,180 @@
+import argparse
+import cmath
+import pathlib
+import sys
+
+import numpy as np
+
+from common.matrix_utils import read_matrix
+from common.typing import Matrix, Vector
+
+MAX_ITERATIONS_PER_VALUE = 30
+
+
+def householder_vector(x: Vector) -> tuple[Vector, float]:
+    # H = E - beta * v * v^T maps `x` to a multiple of the first unit vector
+    v = np.array(x, dtype=np.float64)
+    norm = np.linalg.norm(v)
+    if norm == 0.0:
+        return v, 0.0
+    v[0] += norm if v[0] >= 0.0 else -norm
+    return v, 2.0 / (v @ v)
+
+
+def _reflect_rows(A: Matrix, v: Vector, beta: float) -> None:
+    A -= beta * np.outer(v, v @ A)
+
+
+def _reflect_columns(A: Matrix, v: Vector, beta: float) -> None:
+    A -= beta * np.outer(A @ v, v)
+
+
+def hessenberg(A: Matrix) -> Matrix:
+    """
+    Reduces `A` to the upper Hessenberg form `H = Q^T * A * Q`
+    with Householder reflectors applied as rank-1 updates.
+    """
+
+    H = np.array(A, dtype=np.float64)
+    n = H.shape[0]
+
+    for k in range(n - 2):
+        v, beta = householder_vector(H[k + 1 :, k])
+        _reflect_rows(H[k + 1 :, k:], v, beta)
+        _reflect_columns(H[:, k + 1 :], v, beta)
+        H[k + 2 :, k] = 0.0
+
+    return H
+
+
+def find_complex_eigen_values(A: Matrix, i: int) -> tuple[complex, complex]:
+    # eigen values of the block A[i:i+2, i:i+2]
+    a1, a2 = A[i, i], A[i + 1, i + 1]
+    a3, a4 = A[i + 1, i], A[i, i + 1]
+
+    b = -a1 - a2
+    c = a1 * a2 - a3 * a4
+    d = cmath.sqrt(b * b - 4.0 * c)
+
+    return 0.5 * (-b + d), 0.5 * (-b - d)
+
+
+def _francis_step(H: Matrix, lo: int, hi: int, s: float, t: float) -> None:
+    # implicit double shift step on the active block H[lo:hi+1, lo:hi+1],
+    # shifts are the roots of `z^2 - s * z + t`
+    x = H[lo, lo] * H[lo, lo] + H[lo, lo + 1] * H[lo + 1, lo] - s * H[lo, lo] + t
+    y = H[lo + 1, lo] * (H[lo, lo] + H[lo + 1, lo + 1] - s)
+    z = H[lo + 1, lo] * H[lo + 2, lo + 1]
+
+    for k in range(lo - 1, hi - 2):
+        v, beta = householder_vector([x, y, z])
+        first = max(k, lo)
+        _reflect_rows(H[k + 1 : k + 4, first : hi + 1], v, beta)
+        _reflect_columns(H[lo : min(k + 4, hi) + 1, k + 1 : k + 4], v, beta)
+
+        x, y = H[k + 2, k + 1], H[k + 3, k + 1]
+        if k < hi - 3:
+            z = H[k + 4, k + 1]
+
+    v, beta = householder_vector([x, y])
+    _reflect_rows(H[hi - 1 : hi + 1, hi - 2 : hi + 1], v, beta)
+    _reflect_columns(H[lo : hi + 1, hi - 1 : hi + 1], v, beta)
+
+
+def get_eigen_values(A: Matrix, eps: float = np.finfo(np.float64).eps) -> list[complex]:
+    """
+    QR algorithm: Hessenberg reduction followed by implicit double shift
+    (Francis) steps. A subdiagonal element is treated as zero when it is
+    below `eps` relative to its diagonal neighbours, and the matrix is
+    deflated; 2x2 blocks that are left give pairs of complex eigen values.
+    """
+
+    H = hessenberg(A)
+    n = H.shape[0]
+    values = [0j] * n
+    hi = n - 1
+    iterations = 0
+
+    while hi >= 0:
+        lo = hi
+        while lo > 0 and abs(H[lo, lo - 1]) > eps * (abs(H[lo - 1, lo - 1]) + abs(H[lo, lo])):
+            lo -= 1
+        if lo > 0:
+            H[lo, lo - 1] = 0.0
+
+        if lo == hi:
+            values[hi] = complex(H[hi, hi])
+            hi -= 1
+            iterations = 0
+        elif lo == hi - 1:
+            values[hi - 1], values[hi] = find_complex_eigen_values(H, hi - 1)
+            hi -= 2
+            iterations = 0
+        else:
+            iterations += 1
+            if iterations > MAX_ITERATIONS_PER_VALUE:
+                raise ValueError("QR algorithm didn't converge")
+
+            if iterations % 10 == 0:
+                # exceptional shifts break the cycles of the standard ones
+                w = abs(H[hi, hi - 1]) + abs(H[hi - 1, hi - 2])
+                s, t = 1.5 * w, w * w
+            else:
+                s = H[hi - 1, hi - 1] + H[hi, hi]
+                t = H[hi - 1, hi - 1] * H[hi, hi] - H[hi - 1, hi] * H[hi, hi - 1]
+
+            _francis_step(H, lo, hi, s, t)
+
+    return values
+
+
+# user interface
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-i", "--input-file", type=pathlib.Path, default=None)
+    parser.add_argument("-e", "--eps", type=float, default=float(np.finfo(np.float64).eps))
+    return parser.parse_args()
+
+
+def _read_matrix(input_stream) -> Matrix:
+    n = int(input_stream.readline().strip())
+    if n <= 0:
+        raise ValueError("matrix size can't be negative or zero")
+    return read_matrix(n, n, input_stream)
+
+
+def _print_eigen_values(values: list[complex]) -> None:
+    for value in values:
+        if value.imag == 0.0:
+            print(value.real)
+        else:
+            print(f"{value.real} {'+' if value.imag >= 0.0 else '-'} {abs(value.imag)}i")
+
+
+def _main():
+    args = _parse_args()
+
+    if args.eps < 0.0:
+        raise ValueError("precision can't be a negative value")
+
+    if args.input_file is None:
+        print("Enter matrix size and matrix A:")
+        A = _read_matrix(sys.stdin)
+    else:
+        with args.input_file.open("r", encoding="utf-8") as file:
+            A = _read_matrix(file)
+
+    print("Eigen values:")
+    _print_eigen_values(get_eigen_values(A, args.eps))
+
+
+if __name__ == "__main__":
+    try:
+        _main()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"error: {e}")
+        exit(1)
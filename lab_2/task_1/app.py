@@ -1,4 +1,5 @@
 import sys
+from functools import partial
 from math import *
 
 from common.plot_widget.controllers import RangeSelectionController
@@ -168,7 +169,7 @@ class Task1Window(QWidget):
         chosen_method = self._method_combo_box.currentText()
 
         if chosen_method == "Итераций":
-            method = domain.iterations_method
+            method = partial(domain.iterations_method, expr=self._function_input.text())
         else:
             method = domain.newton_method
 
@@ -1,5 +1,9 @@
+import math
+from functools import lru_cache
 from typing import NamedTuple
 
+import sympy
+from common import interval
 from common.linalg import max_value
 from common.typing import Function
 
@@ -22,18 +26,58 @@ def _sign(x: float) -> float:
     return 1.0
 
 
+@lru_cache(maxsize=32)
+def _abs_derivative(f: Function) -> Function:
+    # the same function object for the same `f` lets `max_value` reuse
+    # its bound on repeated solves
+    df = _derivative(f)
+    return lambda x: abs(df(x))
+
+
+@lru_cache(maxsize=32)
 def _build_phi(f: Function, a: float, b: float) -> Function:
     df = _derivative(f)
-    max_df = max_value(lambda x: abs(df(x)), a, b)
+    max_df = max_value(_abs_derivative(f), a, b)
     sign_f = _sign(df(a))
     return lambda x: x - (sign_f / max_df) * f(x)
 
 
-def iterations_method(f: Function, a: float, b: float, eps: float, iterations: int) -> MethodResult:
+@lru_cache(maxsize=32)
+def _interval_bounds(expr: str, a: float, b: float) -> tuple[float, float, float] | None:
+    # sign of f'(a), max |f'| and max |phi'| on [a, b] from interval
+    # arithmetic, `None` if the expression isn't supported
+    x = sympy.Symbol("x", real=True)
+    try:
+        df = sympy.diff(sympy.sympify(expr, locals={"x": x}), x)
+        sign_f = _sign(float(df.subs(x, a)))
+        max_df = interval.max_abs(df, "x", a, b)
+        if max_df == 0.0 or not math.isfinite(max_df):
+            return None
+        q = interval.max_abs(1 - (sign_f / max_df) * df, "x", a, b)
+    except (sympy.SympifyError, TypeError, ValueError):
+        return None
+    return sign_f, max_df, q
+
+
+def iterations_method(f: Function, a: float, b: float, eps: float, iterations: int, expr: str | None = None) -> MethodResult:
+    """
+    With `expr` (sympy expression of `x` for `f`) the Lipschitz bounds are
+    computed by interval arithmetic instead of sampling.
+    """
+
     x0 = (a + b) / 2.0
-    phi = _build_phi(f, a, b)
-    dphi = _derivative(phi)
-    q = max_value(lambda x: abs(dphi(x)), a, b)
+    bounds = _interval_bounds(expr, a, b) if expr is not None else None
+
+    if bounds is None:
+        phi = _build_phi(f, a, b)
+        q = max_value(_abs_derivative(phi), a, b)
+    else:
+        sign_f, max_df, q = bounds
+        phi = lambda x: x - (sign_f / max_df) * f(x)
+
+    # phi is constant, its value is the fixed point
+    if q == 0.0:
+        return MethodResult(phi(x0), 0)
 
     last_x = x0
     i = 0
@@ -71,4 +115,5 @@ if __name__ == "__main__":
     iterations = 100
 
     print(iterations_method(f, a, b, eps, iterations))
+    print(iterations_method(f, a, b, eps, iterations, expr="2**x + x**2 - 2.0"))
     print(newton_method(f, a, b, eps, iterations))
@@ -110,7 +110,7 @@ class Task2Window(QWidget):
         self._method_preifx = QLabel("Метод: ")
         self._method_combo_box = QComboBox()
 
-        self._method_combo_box.addItems(["Итераций", "Ньютона"])
+        self._method_combo_box.addItems(["Итераций", "Ньютона", "Бройдена"])
 
         self._method_layout.addWidget(self._method_preifx)
         self._method_layout.addWidget(self._method_combo_box, 1)
@@ -184,24 +184,32 @@ class Task2Window(QWidget):
     def _run_solution(self):
         choosed_method = self._method_combo_box.currentText()
 
-        if choosed_method == "Итераций":
-            method = domain.iteration_method
-        else:
-            method = domain.newton_method
-
         s1, s2 = map(np.array, self._rect_area.coords)
         eps = self._epsilon_input.value()
         iterations = self._iteration_input.value()
-        f1 = self._func_1_graphic.function
-        f2 = self._func_2_graphic.function
-        f = domain.VectorFunction(
-            [
-                lambda x: f1(x[0], x[1]),
-                lambda x: f2(x[0], x[1]),
-            ]
-        )
 
-        ans, iterations = method(f, s1, s2, eps, iterations)
+        try:
+            f, jacobian = domain.compile_system(
+                [self._function_1_editor.text(), self._function_2_editor.text()],
+                ["x_1", "x_2"],
+            )
+        except Exception:
+            f1 = self._func_1_graphic.function
+            f2 = self._func_2_graphic.function
+            f = domain.VectorFunction(
+                [
+                    lambda x: f1(x[0], x[1]),
+                    lambda x: f2(x[0], x[1]),
+                ]
+            )
+            jacobian = None
+
+        if choosed_method == "Итераций":
+            ans, iterations = domain.iteration_method(f, s1, s2, eps, iterations)
+        elif choosed_method == "Ньютона":
+            ans, iterations = domain.newton_method(f, s1, s2, eps, iterations, jacobian=jacobian)
+        else:
+            ans, iterations = domain.broyden_method(f, s1, s2, eps, iterations, jacobian=jacobian)
 
         self._answer_label.setText(f"Ответ: x = ({ans[0]:.5f}, {ans[1]:.5f})")
         self._answer_iterations_label.setText(f"Кол-во итераций: {iterations}")
@@ -1,12 +1,19 @@
+from functools import lru_cache
 from math import exp
+from typing import Callable
 from typing import NamedTuple
 
 import numpy as np
+import sympy
 from common.linalg import max_value
 from common.typing import Matrix
 from common.typing import MultiArgFunction
 from common.typing import Vector
 from lab_1 import task_1
+from lab_1.lu_cache import LUCache
+from lab_1.lu_cache import cached_lu_decompose
+from lab_1.sparse import CSRMatrix
+from lab_1.sparse import sparse_lu_factor
 
 
 class MethodResult(NamedTuple):
@@ -23,6 +30,105 @@ class VectorFunction(np.ndarray):
         return np.array([func(x) for func in self])
 
 
+class CompiledVectorFunction:
+    """
+    Vector function evaluated by one call of `func`, which takes the
+    coordinates along the first axis (`x[0]`, `x[1]`, ...) and returns
+    `size` components. Accepts a point `(n,)` or a batch of points
+    `(batch, n)` and returns `(size,)` or `(batch, size)`. Its components
+    take coordinates first, like the functions of `VectorFunction`.
+    """
+
+    def __init__(self, func: Callable[[np.ndarray], list | np.ndarray], size: int) -> None:
+        self._func = func
+        self._size = size
+        self._last_x: Vector | None = None
+        self._buffer = np.empty(size)
+        self._components = [self._component(i) for i in range(size)]
+
+    @classmethod
+    def from_expressions(cls, expressions: list[str | sympy.Expr], variables: list[str | sympy.Symbol]) -> "CompiledVectorFunction":
+        symbols = [sympy.Symbol(v) if isinstance(v, str) else v for v in variables]
+        exprs = [sympy.sympify(expr) for expr in expressions]
+        func = sympy.lambdify(symbols, exprs, "numpy", cse=True)
+        return cls(lambda x: func(*x), len(exprs))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> MultiArgFunction:
+        return self._components[index]
+
+    def _component(self, index: int) -> MultiArgFunction:
+        # components share the buffer, so evaluating all of them at the same
+        # point calls `func` only once
+        def _evaluate(x: Vector | Matrix) -> float | Vector:
+            if np.ndim(x) > 1:
+                return self(np.asarray(x).T)[..., index]
+            if self._last_x is None or not np.array_equal(self._last_x, x):
+                self(x, out=self._buffer)
+                self._last_x = np.array(x, dtype=np.float64)
+            return self._buffer[index]
+
+        return _evaluate
+
+    def __call__(self, x: Vector | Matrix, out: Vector | Matrix | None = None) -> Vector | Matrix:
+        x = np.asarray(x, dtype=np.float64)
+        if out is None:
+            out = np.empty(x.shape[:-1] + (self._size,))
+        elif out is self._buffer:
+            self._last_x = None
+
+        values = self._func(x.T)
+        for i in range(self._size):
+            out[..., i] = values[i]
+        return out
+
+
+class SymbolicSystem(NamedTuple):
+    f: CompiledVectorFunction
+    jacobian: Callable[[Vector], Matrix]
+
+
+@lru_cache(maxsize=32)
+def _compile_system(expressions: tuple[str, ...], variables: tuple[str, ...]) -> SymbolicSystem:
+    symbols = [sympy.Symbol(v) for v in variables]
+    exprs = sympy.Matrix([sympy.sympify(expr) for expr in expressions])
+    unknown = exprs.free_symbols - set(symbols)
+    if unknown:
+        raise ValueError(f"Unknown variables: {', '.join(sorted(map(str, unknown)))}")
+
+    jacobian = exprs.jacobian(symbols)
+    func = sympy.lambdify(symbols, list(exprs), "numpy", cse=True)
+    fused = sympy.lambdify(symbols, [list(exprs), jacobian.tolist()], "numpy", cse=True)
+
+    # newton method asks for the Jacobi matrix and then for the values at
+    # the same point, so the fused call keeps its values for the next `f(x)`
+    last = [None, None]
+
+    def _f(x: Vector | Matrix) -> list | Vector:
+        if x.ndim == 1 and last[0] is not None and np.array_equal(last[0], x):
+            return last[1]
+        return func(*x)
+
+    def _J(x: Vector) -> Matrix:
+        x = np.asarray(x, dtype=np.float64)
+        values, J = fused(*x)
+        last[:] = x.copy(), np.array(values, dtype=np.float64)
+        return np.array(J, dtype=np.float64)
+
+    return SymbolicSystem(CompiledVectorFunction(_f, len(exprs)), _J)
+
+
+def compile_system(expressions: list[str], variables: list[str]) -> SymbolicSystem:
+    """
+    Builds the system and its analytic Jacobi matrix from sympy
+    expressions, the result is cached per expression set.
+    """
+
+    return _compile_system(tuple(map(str, expressions)), tuple(map(str, variables)))
+
+
 def _sign(x: float) -> float:
     if x == 0.0:
         return 0.0
@@ -36,7 +142,8 @@ def _partial_derivative(f: MultiArgFunction, arg_index: int) -> MultiArgFunction
 
     def _df(x):
         n = len(x)
-        x2 = x + np.array([dx if i == arg_index else 0.0 for i in range(n)])
+        offset = np.array([dx if i == arg_index else 0.0 for i in range(n)])
+        x2 = x + offset.reshape((n,) + (1,) * (np.ndim(x) - 1))
         return (f(x2) - f(x)) / dx
 
     return _df
@@ -46,26 +153,69 @@ def _derivative(f: MultiArgFunction, n: int) -> VectorFunction:
     return VectorFunction([_partial_derivative(f, i) for i in range(n)])
 
 
-def _jakobi_matrix(f: VectorFunction) -> VectorFunction:
-    n = len(f)
-    return VectorFunction([_derivative(el, n) for el in f])
+def _evaluate_points(f: VectorFunction, points: Matrix, vectorized: bool) -> Matrix | None:
+    # `f` is tried on all points at once (coordinates along the first axis),
+    # `None` means that it doesn't support such input
+    if isinstance(f, CompiledVectorFunction):
+        return f(points).T
+    if vectorized:
+        try:
+            with np.errstate(all="ignore"):
+                values = np.asarray(f(points.T), dtype=np.float64)
+            if values.shape == (len(f), len(points)):
+                return values
+        except Exception:
+            pass
+        return None
+    return np.array([f(point) for point in points], dtype=np.float64).T
+
+
+def _jakobi_matrix(f: VectorFunction) -> Callable[[Vector], Matrix]:
+    dx = 0.0001
+    vectorized = True
+
+    def _J(x: Vector) -> Matrix:
+        nonlocal vectorized
+        n = len(x)
+
+        # the first point is `x`, the others are `x` moved along every axis,
+        # and every component is evaluated once per point
+        points = np.zeros((n + 1, n))
+        points[0] = x
+        points[1:] = x + dx * np.eye(n)
+
+        values = _evaluate_points(f, points, vectorized)
+        if values is None:
+            vectorized = False
+            values = _evaluate_points(f, points, vectorized)
+
+        return (values[:, 1:] - values[:, :1]) / dx
+
+    return _J
 
 
 def _norm(matrix: Vector) -> float:
     return abs(matrix).max()
 
 
+@lru_cache(maxsize=32)
+def _derivative_norm(f: MultiArgFunction, n: int) -> MultiArgFunction:
+    df = _derivative(f, n)
+    return lambda x: np.abs(df(x)).max(axis=0)
+
+
 def _build_phi(f: VectorFunction, n: int, index: int, s1: Vector, s2: Vector) -> MultiArgFunction:
     f_el = f[index]
-    df = _derivative(f_el, n)
     pdf = _partial_derivative(f_el, index)
     f_sign = _sign(pdf(s1))
-    mx = max_value(lambda x: _norm(df(x)), s1, s2)
+    mx = max_value(_derivative_norm(f_el, n), s1, s2)
     return lambda x: x[index] - (f_sign / mx) * f_el(x)
 
 
-def _solve_system(A: Matrix, b: Vector) -> Vector:
-    l, u, p = task_1.lu_decompose(A)
+def _solve_system(A: Matrix | CSRMatrix, b: Vector, cache: LUCache | None = None) -> Vector:
+    if isinstance(A, CSRMatrix):
+        return sparse_lu_factor(A).solve(b)
+    l, u, p = task_1.lu_decompose(A) if cache is None else cached_lu_decompose(A, cache)
     return task_1.solve_system(l, u, p, b)
 
 
@@ -85,13 +235,28 @@ def iteration_method(f: MultiArgFunction, s1: Vector, s2: Vector, eps: float, it
     return MethodResult(last_x, i)
 
 
-def newton_method(f: MultiArgFunction, s1: Vector, s2: Vector, eps: float, iterations: int) -> MethodResult:
-    J = _jakobi_matrix(f)
+def newton_method(
+    f: MultiArgFunction,
+    s1: Vector,
+    s2: Vector,
+    eps: float,
+    iterations: int,
+    jacobian: Callable[[Vector], Matrix | CSRMatrix] | None = None,
+    cache: LUCache | None = None,
+) -> MethodResult:
+    """
+    `jacobian` replaces the numerical Jacobi matrix, it may return
+    a `CSRMatrix` for sparse systems. `compile_system` gives the analytic
+    one for sympy expressions. `cache` reuses LU factorizations of equal
+    Jacobi matrices (e.g. for linear systems solved repeatedly).
+    """
+
+    J = jacobian or _jakobi_matrix(f)
     last_x = (s1 + s2) / 2.0
     i = 0
 
     while i <= iterations:
-        dx = _solve_system(J(last_x), -f(last_x))
+        dx = _solve_system(J(last_x), -f(last_x), cache)
         x = last_x + dx
 
         if _norm(x - last_x) <= eps:
@@ -103,6 +268,66 @@ def newton_method(f: MultiArgFunction, s1: Vector, s2: Vector, eps: float, itera
     return MethodResult(last_x, i)
 
 
+def _inverse_jacobian(J: Callable[[Vector], Matrix | CSRMatrix], x: Vector) -> Matrix:
+    m = J(x)
+    if isinstance(m, CSRMatrix):
+        m = m.to_dense()
+    return task_1.lu_factor(m).inverse()
+
+
+def broyden_method(
+    f: MultiArgFunction,
+    s1: Vector,
+    s2: Vector,
+    eps: float,
+    iterations: int,
+    jacobian: Callable[[Vector], Matrix | CSRMatrix] | None = None,
+    update: str = "good",
+) -> MethodResult:
+    """
+    Quasi-Newton method: the inverse Jacobi matrix is formed once and
+    then corrected by rank-1 (Sherman-Morrison) updates, `update` is
+    "good" or "bad" Broyden. The matrix is formed again only when the
+    residual stops decreasing.
+    """
+
+    if update not in ("good", "bad"):
+        raise ValueError(f"Unknown update: {update}")
+
+    J = jacobian or _jakobi_matrix(f)
+    last_x = (s1 + s2) / 2.0
+    last_f = np.asarray(f(last_x), dtype=np.float64)
+    H = _inverse_jacobian(J, last_x)
+    i = 0
+
+    while i <= iterations:
+        dx = -H @ last_f
+        x = last_x + dx
+
+        if _norm(x - last_x) <= eps:
+            return MethodResult(x, i)
+
+        new_f = np.asarray(f(x), dtype=np.float64)
+        df = new_f - last_f
+        h_df = H @ df
+
+        if update == "good":
+            v = dx @ H
+        else:
+            v = df
+        denominator = v @ df
+
+        if _norm(new_f) >= _norm(last_f) or denominator == 0.0:
+            H = _inverse_jacobian(J, x)
+        else:
+            H += np.outer(dx - h_df, v / denominator)
+
+        last_x, last_f = x, new_f
+        i += 1
+
+    return MethodResult(last_x, i)
+
+
 if __name__ == "__main__":
     a = 2.0
     f1 = lambda x: x[0] ** 2 + x[1] ** 2 - a**2
@@ -116,3 +341,4 @@ if __name__ == "__main__":
 
     print(iteration_method(f, s1, s2, eps, iterations))
     print(newton_method(f, s1, s2, eps, iterations))
+    print(broyden_method(f, s1, s2, eps, iterations))
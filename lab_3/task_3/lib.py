@@ -2,12 +2,13 @@ import numpy as np
 
 from common.typing import Function
 from lab_1 import task_1
+from lab_1.lu_cache import LUCache, cached_lu_decompose
 
 
 class MinimalSquareInterpolation:
-    def __init__(self, n: int, nodes: list[tuple[float, float]]) -> None:
+    def __init__(self, n: int, nodes: list[tuple[float, float]], cache: LUCache | None = None) -> None:
         A, b = self._get_normal_system_coefs(nodes, n)
-        l, u, p = task_1.lu_decompose(A)
+        l, u, p = task_1.lu_decompose(A) if cache is None else cached_lu_decompose(A, cache)
         self._coef = task_1.solve_system(l, u, p, b)
 
     @classmethod